@@ -0,0 +1,20 @@
+import re
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+
+
+def _source_version() -> str:
+    """[project] version from pyproject.toml, for runs from a source checkout that is not installed."""
+    try:
+        text = (Path(__file__).resolve().parent.parent / "pyproject.toml").read_text(encoding="utf-8")
+    except OSError:
+        return "0+unknown"
+    match = re.search(r'^\[project\][^\[]*?^version\s*=\s*"([^"]+)"', text, re.MULTILINE | re.DOTALL)
+    return match.group(1) if match else "0+unknown"
+
+
+# Single-sourced from pyproject.toml; cache keys and the build manifest fingerprint depend on it
+try:
+    __version__ = version("api_description_tool")
+except PackageNotFoundError:
+    __version__ = _source_version()
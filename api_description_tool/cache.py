@@ -0,0 +1,169 @@
+"""
+Persistent on-disk cache for parsed specs.
+Entries are pickled values stored one-per-file under <cache_dir>/<namespace>/ and
+evicted least-recently-used first once the namespace grows past `max_bytes`.
+
+Exports
+-------
+- default_cache_dir()
+- file_digest(data)
+- spec_fingerprint(obj)
+- DiskCache(root, namespace, max_bytes=DEFAULT_MAX_BYTES)
+- get_or_load(cache, key, loader)
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from . import __version__
+
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+CACHE_DIR_ENV = "API_DESC_TOOL_CACHE_DIR"
+
+_MISSING = object()
+
+
+def default_cache_dir() -> Path:
+    """Cache location: $API_DESC_TOOL_CACHE_DIR, else $XDG_CACHE_HOME/api_description_tool,
+    else ~/.cache/api_description_tool."""
+    env = os.environ.get(CACHE_DIR_ENV)
+    if env:
+        return Path(env)
+    xdg = os.environ.get("XDG_CACHE_HOME")
+    base = Path(xdg) if xdg else Path.home() / ".cache"
+    return base / "api_description_tool"
+
+
+def file_digest(data: bytes) -> str:
+    """Content hash used in cache keys."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def _encode(obj, out: list) -> None:
+    if isinstance(obj, dict):
+        out.append("{")
+        for k, v in obj.items():
+            _encode(k, out)
+            out.append(":")
+            _encode(v, out)
+            out.append(",")
+        out.append("}")
+    elif isinstance(obj, (list, tuple)):
+        out.append("[")
+        for v in obj:
+            _encode(v, out)
+            out.append(",")
+        out.append("]")
+    else:
+        # type tag keeps 1, 1.0, True and "1" apart
+        out.append(type(obj).__name__)
+        out.append(repr(obj))
+
+
+def spec_fingerprint(obj: Any) -> str:
+    """Hash of a loaded spec (or any YAML-shaped value) in a canonical, type-tagged encoding.
+    Key order is kept: validator error messages depend on it, so equal fingerprints
+    guarantee identical validation outcomes.
+    """
+    out: list = []
+    _encode(obj, out)
+    return hashlib.sha256("".join(out).encode("utf-8", "surrogatepass")).hexdigest()
+
+
+class DiskCache:
+    """Size-bounded LRU cache of pickled values on disk.
+
+    Keys are combined with the tool version so upgrading the tool never serves stale entries.
+    Writes are atomic (temp file + rename), so concurrent processes may share a cache dir.
+    """
+
+    suffix = ".pkl"
+
+    def __init__(self, root: Union[str, Path], namespace: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.dir = Path(root) / namespace
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> Path:
+        return self.dir / f"{__version__}-{key}{self.suffix}"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        p = self._path(key)
+        try:
+            with p.open("rb") as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return default
+        except Exception:
+            # Corrupt/incompatible entry -> drop it and treat as a miss
+            self._unlink(p)
+            self.misses += 1
+            return default
+        # Refresh recency for LRU eviction
+        try:
+            os.utime(p)
+        except OSError:
+            pass
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        try:
+            self.dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp, self._path(key))
+            except BaseException:
+                self._unlink(Path(tmp))
+                raise
+        except OSError:
+            # A cache that cannot be written is not an error for the caller
+            return
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        total = 0
+        for p in self.dir.glob(f"*{self.suffix}"):
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+            total += st.st_size
+        if total <= self.max_bytes:
+            return
+        entries.sort(key=lambda e: e[0])  # oldest first
+        for _, size, p in entries:
+            if total <= self.max_bytes:
+                break
+            self._unlink(p)
+            total -= size
+
+    @staticmethod
+    def _unlink(p: Path) -> None:
+        try:
+            p.unlink()
+        except OSError:
+            pass
+
+
+def get_or_load(cache: Optional[DiskCache], key: str, loader):
+    """Return cache[key], computing and storing it with loader() on a miss."""
+    if cache is None:
+        return loader()
+    value = cache.get(key, _MISSING)
+    if value is _MISSING:
+        value = loader()
+        cache.put(key, value)
+    return value
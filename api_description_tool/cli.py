@@ -1,20 +1,33 @@
 # api_description_tool/cli.py
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import argparse
+import contextlib
+import glob
+import io
+import os
+import re
 import sys
+import time
 
+from api_description_tool.cache import DEFAULT_MAX_BYTES, DiskCache, default_cache_dir, file_digest
 from api_description_tool.config import load_config
-from api_description_tool.parser import load_yaml, validate_openapi
+from api_description_tool.parser import load_yaml, validate_openapi, resolve_yaml_engine
+from api_description_tool.flattener import ResolutionContext
+from api_description_tool.rows import BodyRow, ParamRow, ResponseRow
 from api_description_tool.tables import (
-    build_request_params_table,
-    build_request_body_table,
-    build_response_body_table,
+    build_tables,
+    iter_request_body_rows,
+    iter_request_params_rows,
+    iter_response_body_rows,
+    resolution_context,
 )
-from api_description_tool.writer_excel import write_excel
-from api_description_tool.writer_csv import write_csv
+from api_description_tool.writer_excel import resolve_excel_engine, write_excel
+from api_description_tool.writer_csv import CSV_COMPRESSIONS, STREAM_TABLES, write_csv, write_csv_stream
+from api_description_tool.manifest import Manifest, build_fingerprint
 
 # CR-001 filtering
-from api_description_tool.filter import load_filter_rules, apply_filters, FilteringError
+from api_description_tool.filter import load_filter_rules, apply_filters, list_operations, FilteringError
 
 
 def _to_bool(val, default=True):
@@ -42,124 +55,452 @@ def _ensure_min_rows(rows, kind):
 
     if kind == "params":
         # Name | Mandatory | Expected Value(s) | In | Description | Examples
-        return [
-            {
-                "Name": "",
-                "Mandatory": "",
-                "Expected Value(s)": "",
-                "In": "",
-                "Description": "",
-                "Examples": "",
-            }
-        ]
+        return [ParamRow()]
     elif kind == "req":
         # Path | Property | Mandatory | Expected Value(s) | Description | Examples
-        return [
-            {
-                "Path": "",
-                "Property": "",
-                "Mandatory": "",
-                "Expected Value(s)": "",
-                "Description": "",
-                "Examples": "",
-            }
-        ]
+        return [BodyRow()]
     elif kind == "res":
         # Status | Path | Property | Mandatory | Expected Value(s) | Description | Examples
-        return [
-            {
-                "Status": "",
-                "Path": "",
-                "Property": "",
-                "Mandatory": "",
-                "Expected Value(s)": "",
-                "Description": "",
-                "Examples": "",
-            }
-        ]
+        return [ResponseRow()]
     else:
         return [{}]
 
 
-def main():
-    parser = argparse.ArgumentParser(
-        description="API Description Tool - Convert OpenAPI 3.x YAML to tables"
+def _open_cache(cache_section: dict, namespace: str, disabled: bool = False):
+    """Build the on-disk cache for `namespace` from [cache], or None when caching is off."""
+    if disabled or not _to_bool(cache_section.get("enabled", "True"), default=True):
+        return None
+    root = (cache_section.get("dir") or "").strip() or default_cache_dir()
+    max_mb = (cache_section.get("max_size_mb") or "").strip()
+    max_bytes = int(float(max_mb) * 1024 * 1024) if max_mb else DEFAULT_MAX_BYTES
+    return DiskCache(root, namespace, max_bytes=max_bytes)
+
+
+def _resolve_base_name(input_path: Path, output_file, out_section: dict) -> str:
+    """Output base precedence: positional arg > config file_name (unless default) > <input_stem>_api_tab_desc."""
+    cfg_base = (out_section.get("file_name") or "").strip()
+    if output_file:
+        return output_file
+    if cfg_base and cfg_base.lower() != "api_tab_desc":
+        return cfg_base
+    return f"{input_path.stem}_api_tab_desc"
+
+
+def _operation_slug(path: str, method: str) -> str:
+    """File-name friendly id for an operation, e.g. ("/pets/{id}", "GET") -> "get_pets_id"."""
+    words = re.findall(r"[A-Za-z0-9]+", path)
+    return "_".join([method.lower()] + words) if words else f"{method.lower()}_root"
+
+
+def _build_tables(spec: dict, cfg: dict, ctx: ResolutionContext):
+    """Build Params / Req Body / Res Body rows, padding empty tables so writers still emit headers."""
+    params, req_body, res_body = build_tables(spec, cfg, ctx)
+
+    # Ensure we always produce files
+    params = _ensure_min_rows(params, "params")
+    req_body = _ensure_min_rows(req_body, "req")
+    res = _ensure_min_rows(res_body, "res")
+    if res_body and all("Status" in r for r in res_body):
+        res = res_body
+    return params, req_body, res
+
+
+class _CountedRows:
+    """Iterable over `rows` that counts what has been consumed, so a streamed table's size
+    can be reported once it is written."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.count = 0
+
+    def __iter__(self):
+        for row in self.rows:
+            self.count += 1
+            yield row
+
+
+_TABLE_ROWS = (
+    ("params", "Parameter", iter_request_params_rows),
+    ("req_body", "Request body", iter_request_body_rows),
+    ("res_body", "Response body", iter_response_body_rows),
+)
+
+
+def _iter_tables(spec: dict, cfg: dict, ctx: ResolutionContext, table: str = "all"):
+    """Lazy Params / Req Body / Res Body rows for the CSV writers, which emit the header line
+    of an empty table themselves. No table is held in memory as a whole; tables other than
+    `table` ("all" for every one) are left empty and never flattened."""
+    return tuple(
+        _CountedRows(rows_of(spec, cfg, ctx) if table in {"all", name} else ())
+        for name, _, rows_of in _TABLE_ROWS
     )
-    parser.add_argument("input_file", help="Path to OpenAPI YAML file")
-    parser.add_argument("output_file", nargs="?", help="Optional output base/file")
-    parser.add_argument("--config", default="config.ini", help="Path to config file")
-    args = parser.parse_args()
 
-    try:
-        # --- Config ---
-        cfg = load_config(args.config)  # returns a dict with sections or {}
 
-        out_section = cfg.get("output", {}) if isinstance(cfg, dict) else {}
-        in_section = cfg.get("input", {}) if isinstance(cfg, dict) else {}
+def _tables_for(fmt: str, spec: dict, cfg: dict, ctx: ResolutionContext):
+    """Rows to hand to _write_tables: streamed for CSV, one pass per table; for Excel, lists
+    from build_tables' single sweep (parallel with `[tables] workers`)."""
+    if fmt == "csv":
+        return _iter_tables(spec, cfg, ctx)
+    return _build_tables(spec, cfg, ctx)
 
-        validate_flag = _to_bool(in_section.get("validate", "True"), default=True)
-        fmt = (out_section.get("format") or "xlsx").strip().lower()
 
-        input_path = Path(args.input_file)
+def _row_count(rows) -> int:
+    return rows.count if isinstance(rows, _CountedRows) else len(rows)
 
-        # default base name: <input_stem>_api_tab_desc
-        default_base = f"{input_path.stem}_api_tab_desc"
-        cfg_base = (out_section.get("file_name") or "").strip()
 
-        if args.output_file:
-            base_name = args.output_file
-        elif cfg_base and cfg_base.lower() != "api_tab_desc":
-            base_name = cfg_base
-        else:
-            base_name = default_base
+def _write_tables(
+        fmt: str,
+        base_name: str,
+        params,
+        req_body,
+        res,
+        excel_engine: str = "openpyxl",
+        max_rows_per_sheet=None,
+        csv_compression: str = "none",
+) -> list:
+    """Write the tables; returns the paths of the files written."""
+    if fmt in {"xlsx", "excel"}:
+        out_path = base_name + ".xlsx"
+        write_excel(out_path, params, req_body, res, engine=excel_engine, max_rows_per_sheet=max_rows_per_sheet)
+        print(f"✅ Wrote Excel file: {out_path}")
+        return [out_path]
+    elif fmt == "csv":
+        written = write_csv(base_name, params, req_body, res, compression=csv_compression)
+        print(f"✅ Wrote CSV files with base: {base_name}")
+        return written
+    else:
+        raise ValueError(f"Unsupported output format: {fmt}")
+
+
+def _run(
+        input_file: str,
+        output_file,
+        cfg: dict,
+        *,
+        no_cache: bool = False,
+        all_operations: bool = False,
+        force: bool = False,
+        stream=None,
+) -> None:
+    """Full pipeline for one input file: load -> filter -> validate -> tables -> write.
+    Skips the work when the build manifest shows the outputs are up to date (unless `force`).
+    With output_file "-" the CSV goes to `stream` (default sys.stdout) instead of files,
+    and there is no manifest check.
+    Raises FilteringError / ValueError / FileNotFoundError on failure.
+    """
+    out_section = cfg.get("output", {}) if isinstance(cfg, dict) else {}
+    in_section = cfg.get("input", {}) if isinstance(cfg, dict) else {}
+    cache_section = cfg.get("cache", {}) if isinstance(cfg, dict) else {}
+    filter_section = cfg.get("filtering", {}) if isinstance(cfg, dict) else {}
 
-        print(f"Input file: {input_path}")
+    validate_flag = _to_bool(in_section.get("validate", "True"), default=True)
+    validate_scope = (in_section.get("validate_scope") or "full").strip().lower()
+    if validate_scope not in {"full", "operation"}:
+        raise ValueError(f"Unsupported validate_scope: {validate_scope} (expected full|operation)")
+    fmt = (out_section.get("format") or "xlsx").strip().lower()
+    if fmt not in {"xlsx", "excel", "csv"}:
+        raise ValueError(f"Unsupported output format: {fmt}")
+    yaml_engine = resolve_yaml_engine(in_section.get("yaml_engine", "auto"))
+    excel_engine = resolve_excel_engine(out_section.get("excel_engine", "openpyxl"))
+    max_rows_raw = (out_section.get("max_rows_per_sheet") or "").strip()
+    if max_rows_raw and not (max_rows_raw.isdigit() and int(max_rows_raw) > 0):
+        raise ValueError(f"Unsupported max_rows_per_sheet: {max_rows_raw} (expected a positive integer)")
+    max_rows_per_sheet = int(max_rows_raw) if max_rows_raw else None
+    csv_compression = (out_section.get("compression") or "none").strip().lower()
+    if csv_compression not in CSV_COMPRESSIONS:
+        raise ValueError(f"Unsupported compression: {csv_compression} (expected {'|'.join(CSV_COMPRESSIONS)})")
+    tree_shake = _to_bool(filter_section.get("tree_shake"), default=False)
+    to_stream = output_file == "-"
+    stream_table = (out_section.get("stdout_table") or "all").strip().lower()
+    if stream_table not in STREAM_TABLES:
+        raise ValueError(f"Unsupported stdout_table: {stream_table} (expected {'|'.join(STREAM_TABLES)})")
+    if to_stream and all_operations:
+        raise ValueError("Output '-' (stdout) cannot be combined with --all-operations")
+
+    input_path = Path(input_file)
+    base_name = _resolve_base_name(input_path, output_file, out_section)
+
+    print(f"Input file: {input_path}")
+    if to_stream:
+        # stdout carries one CSV stream whatever [output] format says
+        fmt = "csv"
+        print(f"Output: stdout (table: {stream_table})")
+    else:
         print(f"Resolved output base: {Path(base_name).resolve()}")
-        print(f"Selected format: {fmt}")
-        print(f"Validation enabled: {validate_flag}")
+    print(f"Selected format: {fmt}")
+    print(f"Validation enabled: {validate_flag}")
+    if validate_flag:
+        print(f"Validation scope: {validate_scope}")
+    print(f"YAML engine: {yaml_engine}")
+    if fmt in {"xlsx", "excel"}:
+        print(f"Excel engine: {excel_engine}")
 
-        # --- Load YAML ---
-        spec = load_yaml(args.input_file)
+    # --- Incremental build: skip when inputs/config/version are unchanged ---
+    manifest = Manifest(Path(base_name).resolve().parent)
+    manifest_key = Path(base_name).name
+    fingerprint = None
+    if input_path.is_file() and not to_stream:
+        fingerprint = build_fingerprint(
+            file_digest(input_path.read_bytes()), cfg, all_operations=all_operations
+        )
+        if not force and manifest.is_fresh(manifest_key, fingerprint):
+            print(f"Up to date, skipping: {base_name} (use --force to rebuild)")
+            return
+    written = []
+
+    # --- Load YAML ---
+    spec_cache = _open_cache(cache_section, "specs", disabled=no_cache)
+    spec = load_yaml(input_file, engine=yaml_engine, cache=spec_cache)
+    if spec_cache is None:
+        print("Spec cache: disabled")
+    else:
+        print(f"Spec cache: {'hit' if spec_cache.hits else 'miss'} ({spec_cache.dir})")
 
-        # --- CR-001: filtering (after YAML load, before parsing/tables) ---
+    def validate(s: dict) -> None:
+        validation_cache = _open_cache(cache_section, "validation", disabled=no_cache)
         try:
-            rules = load_filter_rules(cfg)  # accepts dict-style config
-            spec = apply_filters(spec, rules)
-        except FilteringError as e:
-            print(f"[Filtering] {e}")
-            sys.exit(1)
+            validate_openapi(s, cache=validation_cache, scoped=validate_scope == "operation")
+        finally:
+            if validation_cache is not None:
+                print(f"Validation cache: {'hit' if validation_cache.hits else 'miss'}")
 
-        # --- (Optional) Validate OpenAPI ---
+    if all_operations:
+        # --- Batch: validate once, then one output per operation ---
+        operations = list_operations(spec)
+        if not operations:
+            raise FilteringError("Your spec contains no operations to render.")
+        print(f"Batch mode: {len(operations)} operations")
         if validate_flag:
-            validate_openapi(spec)
-
-        # --- Build tables ---
-        params = build_request_params_table(spec, cfg)
-        req_body = build_request_body_table(spec, cfg)
-        res_body = build_response_body_table(spec, cfg)
-
-        # Ensure we always produce files
-        params = _ensure_min_rows(params, "params")
-        req_body = _ensure_min_rows(req_body, "req")
-        res = _ensure_min_rows(res_body, "res")
-        if res_body and all("Status" in r for r in res_body):
-            res = res_body
-
-        print(f"Parameter table rows: {len(params)}")
-        print(f"Request body table rows: {len(req_body)}")
-        print(f"Response body table rows: {len(res)}")
-
-        # --- Write output ---
-        if fmt in {"xlsx", "excel"}:
-            out_path = base_name + ".xlsx"
-            write_excel(out_path, params, req_body, res)
-            print(f"✅ Wrote Excel file: {out_path}")
-        elif fmt == "csv":
-            write_csv(base_name, params, req_body, res)
-            print(f"✅ Wrote CSV files with base: {base_name}")
+            validate(spec)
+        ctx = resolution_context(spec, cfg)  # shared by every operation
+        used = set()
+        for path, method in operations:
+            slug = _operation_slug(path, method)
+            unique, n = slug, 2
+            while unique in used:
+                unique, n = f"{slug}_{n}", n + 1
+            used.add(unique)
+
+            op_spec = apply_filters(spec, {"path": path, "method": method}, tree_shake=tree_shake)
+            params, req_body, res = _tables_for(fmt, op_spec, cfg, ctx)
+            written += _write_tables(
+                fmt, f"{base_name}_{unique}", params, req_body, res, excel_engine, max_rows_per_sheet, csv_compression
+            )
+            print(
+                f"Operation {method} {path}: params={_row_count(params)}, "
+                f"req={_row_count(req_body)}, res={_row_count(res)}"
+            )
+        _print_ref_stats(ctx)
+        _record_build(manifest, manifest_key, fingerprint, written)
+        return
+
+    # --- CR-001: filtering (after YAML load, before parsing/tables) ---
+    rules = load_filter_rules(cfg)  # accepts dict-style config
+    spec = apply_filters(spec, rules, tree_shake=tree_shake)
+
+    # --- (Optional) Validate OpenAPI ---
+    if validate_flag:
+        validate(spec)
+
+    # --- Build tables ---
+    ctx = resolution_context(spec, cfg)
+    if to_stream:
+        # rows go out as they are flattened, and only for the selected table(s)
+        tables = _iter_tables(spec, cfg, ctx, stream_table)
+        write_csv_stream(stream or sys.stdout, *tables, table=stream_table)
+        for (name, label, _), rows in zip(_TABLE_ROWS, tables):
+            if stream_table in {"all", name}:
+                print(f"{label} table rows: {rows.count}")
+        _print_ref_stats(ctx)
+        print(f"✅ Wrote CSV ({stream_table}) to stdout")
+        return
+
+    # --- Write output (CSV rows are built while they are written) ---
+    params, req_body, res = _tables_for(fmt, spec, cfg, ctx)
+    written += _write_tables(
+        fmt, base_name, params, req_body, res, excel_engine, max_rows_per_sheet, csv_compression
+    )
+    print(f"Parameter table rows: {_row_count(params)}")
+    print(f"Request body table rows: {_row_count(req_body)}")
+    print(f"Response body table rows: {_row_count(res)}")
+    _print_ref_stats(ctx)
+    _record_build(manifest, manifest_key, fingerprint, written)
+
+
+def _print_ref_stats(ctx: ResolutionContext) -> None:
+    stats = ctx.stats()
+    print(f"$ref resolution cache: {stats['hits']} hits, {stats['misses']} misses")
+    if stats["merge_hits"] or stats["merge_misses"]:
+        print(f"Composite merge cache: {stats['merge_hits']} hits, {stats['merge_misses']} misses")
+    if ctx.depth_truncations:
+        print(
+            f"Warning: depth budget reached at {len(ctx.depth_truncations)} path(s), "
+            f"first: {ctx.depth_truncations[0]} (raise [tables] max_depth or set it to none)"
+        )
+
+
+def _record_build(manifest: Manifest, key: str, fingerprint, written: list) -> None:
+    if fingerprint is None:
+        return
+    manifest.record(key, fingerprint, written)
+    manifest.save()
+
+
+def _expand_inputs(patterns) -> list:
+    """Expand files, directories (recursive *.yaml/*.yml) and glob patterns into a list
+    de-duplicated on the resolved path (so "a.yaml" and "./a.yaml" run once).
+    Names and glob patterns that match nothing are kept so they are reported as failures,
+    not silently dropped.
+    """
+    found = []
+    for pattern in patterns:
+        p = Path(pattern)
+        if p.is_dir():
+            found.extend(sorted(f for f in p.rglob("*") if f.suffix.lower() in {".yaml", ".yml"} and f.is_file()))
+        elif glob.has_magic(pattern):
+            found.extend(Path(m) for m in sorted(glob.glob(pattern, recursive=True)) or [pattern])
+        else:
+            found.append(p)
+    unique = {}
+    for path in found:
+        unique.setdefault(path.resolve(), path)
+    return list(unique.values())
+
+
+def _process_file(
+        input_file: str, output_base: str, cfg: dict, no_cache: bool, all_operations: bool, force: bool
+) -> dict:
+    """Worker entry point for multi-file mode: run the pipeline quietly and report the outcome."""
+    started = time.perf_counter()
+    log = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(log):
+            _run(input_file, output_base, cfg, no_cache=no_cache, all_operations=all_operations, force=force)
+        error = None
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    return {
+        "input": input_file,
+        "ok": error is None,
+        "error": error,
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def _run_many(
+        patterns, cfg: dict, *, output_dir: str, workers: int, no_cache: bool, all_operations: bool, force: bool
+) -> int:
+    """Multi-file mode: fan out _run over a process pool. Returns the number of failed files."""
+    inputs = _expand_inputs(patterns)
+    if not inputs:
+        raise FileNotFoundError(f"No input files matched: {' '.join(patterns)}")
+    out_dir = Path(output_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    if workers > 1 and len(inputs) > 1 and isinstance(cfg, dict):
+        # files already run in parallel here; keep each file's table build serial
+        cfg = {**cfg, "tables": {**(cfg.get("tables") or {}), "workers": "1"}}
+    jobs, used = [], set()
+    for path in inputs:
+        base, n = f"{path.stem}_api_tab_desc", 2
+        unique = base
+        while unique in used:
+            unique, n = f"{base}_{n}", n + 1
+        used.add(unique)
+        jobs.append((str(path), str(out_dir / unique), cfg, no_cache, all_operations, force))
+
+    workers = max(1, min(workers, len(jobs)))
+    print(f"Input files: {len(jobs)} (workers: {workers})")
+    started = time.perf_counter()
+    if workers == 1:
+        results = [_process_file(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_process_file, *job) for job in jobs]
+            results = [f.result() for f in futures]
+
+    for r in results:
+        if r["ok"]:
+            print(f"[OK] {r['input']} ({r['seconds']:.2f}s)")
         else:
-            raise ValueError(f"Unsupported output format: {fmt}")
+            print(f"[FAILED] {r['input']} ({r['seconds']:.2f}s): {r['error']}")
+    failed = sum(1 for r in results if not r["ok"])
+    print(
+        f"Processed {len(results)} files: {len(results) - failed} ok, {failed} failed "
+        f"in {time.perf_counter() - started:.2f}s"
+    )
+    return failed
+
 
+def main():
+    parser = argparse.ArgumentParser(
+        description="API Description Tool - Convert OpenAPI 3.x YAML to tables"
+    )
+    parser.add_argument("input_file", nargs="?", help="Path to OpenAPI YAML file")
+    parser.add_argument("output_file", nargs="?", help="Optional output base/file; '-' streams CSV to stdout")
+    parser.add_argument("--config", default="config.ini", help="Path to config file")
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or write the on-disk cache")
+    parser.add_argument("--force", action="store_true", help="Rebuild outputs even if the build manifest says they are up to date")
+    parser.add_argument(
+        "--all-operations",
+        action="store_true",
+        help="Render every operation of the spec into its own output (<base>_<method>_<path>); "
+             "[filtering] path/method are ignored",
+    )
+    parser.add_argument(
+        "--inputs",
+        nargs="+",
+        metavar="PATH",
+        help="Multi-file mode: files, directories (searched for *.yaml/*.yml) or glob patterns",
+    )
+    parser.add_argument("--workers", type=int, help="Worker processes for --inputs (default: [batch] workers or CPU count)")
+    parser.add_argument("--output-dir", default=".", help="Directory for --inputs outputs (default: CWD)")
+    args = parser.parse_args()
+    if bool(args.inputs) == bool(args.input_file):
+        parser.error("give either input_file or --inputs")
+    if args.inputs and args.output_file:
+        parser.error("output_file cannot be combined with --inputs; use --output-dir")
+
+    if args.output_file == "-":
+        # stdout carries the CSV; status lines and errors go to stderr
+        stream = sys.stdout
+        with contextlib.redirect_stdout(sys.stderr):
+            _main(args, stream)
+    else:
+        _main(args)
+
+
+def _main(args, stream=None) -> None:
+    try:
+        # --- Config ---
+        cfg = load_config(args.config)  # returns a dict with sections or {}
+        if args.inputs:
+            batch_section = cfg.get("batch", {}) if isinstance(cfg, dict) else {}
+            workers = args.workers or int(batch_section.get("workers") or 0) or os.cpu_count() or 1
+            failed = _run_many(
+                args.inputs,
+                cfg,
+                output_dir=args.output_dir,
+                workers=workers,
+                no_cache=args.no_cache,
+                all_operations=args.all_operations,
+                force=args.force,
+            )
+            if failed:
+                sys.exit(1)
+            return
+        _run(
+            args.input_file,
+            args.output_file,
+            cfg,
+            no_cache=args.no_cache,
+            all_operations=args.all_operations,
+            force=args.force,
+            stream=stream,
+        )
+    except FilteringError as e:
+        print(f"[Filtering] {e}")
+        sys.exit(1)
     except (FileNotFoundError, ValueError) as e:
         print(f"[Error] {e}")
         sys.exit(1)
@@ -169,4 +510,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
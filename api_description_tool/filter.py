@@ -2,20 +2,29 @@
 """
 CR-001: Endpoint Filtering
 -------------------------
-Exposes two functions:
+Exposes:
   - load_filter_rules(config): read [filtering] from a ConfigParser
-  - apply_filters(spec, rules): return a pruned OpenAPI dict according to rules
-
-This module is intentionally self-contained and has no external deps.
-It does not mutate the incoming `spec` dict.
+  - apply_filters(spec, rules, tree_shake=False): return a pruned OpenAPI dict according to rules
+  - list_operations(spec): every (path, METHOD) pair, in spec order (batch mode)
+
+With tree_shake=True, `components` is reduced to the entries transitively reachable
+from the selected operation (see refs.reachable_refs).
+
+This module has no external deps.
+It does not mutate the incoming `spec` dict, and it does not copy it either: the
+result is a new top-level dict (and a new `paths` / path item for the selection)
+that shares every other subtree with the input. Filtering therefore costs
+O(size of the selected path item), and the result must be treated as read-only —
+callers that need to edit it should deepcopy it themselves.
 """
-from copy import deepcopy
 from configparser import ConfigParser
 from typing import Dict, Optional, Tuple
 
-from typing import Dict, Optional, Tuple, Mapping
+from typing import Dict, List, Optional, Tuple, Mapping
 from configparser import ConfigParser
 
+from api_description_tool.refs import prune_components, reachable_refs
+
 HTTP_METHODS = {"get","put","post","delete","options","head","patch","trace"}
 
 class FilteringError(ValueError):
@@ -65,19 +74,40 @@ def _count_paths_and_methods(spec: Dict) -> Tuple[int, int]:
             total_methods += sum(1 for k in node.keys() if k.lower() in HTTP_METHODS)
     return total_paths, total_methods
 
-def apply_filters(spec: Dict, rules: Dict[str, Optional[str]]):
+def list_operations(spec: Dict) -> List[Tuple[str, str]]:
+    """Return (path, METHOD) for every operation in the spec, in document order.
+    Each pair is a valid `rules` input for apply_filters.
+    """
+    ops: List[Tuple[str, str]] = []
+    for path, node in (spec.get("paths") or {}).items():
+        if isinstance(node, dict):
+            ops.extend((path, k.upper()) for k in node.keys() if k.lower() in HTTP_METHODS)
+    return ops
+
+
+def _tree_shake(spec: Dict) -> Dict:
+    """Drop components not reachable from the (already pruned) paths."""
+    return prune_components(spec, reachable_refs(spec))
+
+
+def apply_filters(spec: Dict, rules: Dict[str, Optional[str]], tree_shake: bool = False):
     """Apply CR-001 filtering rules to an OpenAPI 3.x dict.
 
     FR-002: If no rules and the spec has exactly one path and one method -> return spec unchanged.
     FR-003: If no rules and spec has >1 path or (1 path with >1 method) -> error.
     FR-004..FR-007: Validation around path/method presence/consistency.
+    tree_shake: also drop unreachable schemas/parameters/responses/requestBodies/... from `components`.
     """
+    new_spec = _apply_rules(spec, rules)
+    return _tree_shake(new_spec) if tree_shake else new_spec
+
+
+def _apply_rules(spec: Dict, rules: Dict[str, Optional[str]]):
     if not isinstance(spec, dict):
         raise TypeError("apply_filters expects an OpenAPI spec dict")
 
-    spec_copy = deepcopy(spec)
-    paths = (spec_copy.get("paths") or {})
-    rules = rules or {}
+    paths = (spec.get("paths") or {})
+    rules = dict(rules or {})  # never mutate the caller's rules
 
     # Normalize method if present
     if "method" in rules and rules["method"]:
@@ -85,9 +115,9 @@ def apply_filters(spec: Dict, rules: Dict[str, Optional[str]]):
 
     # Case A: No [filtering] provided
     if not rules:
-        total_paths, total_methods = _count_paths_and_methods(spec_copy)
+        total_paths, total_methods = _count_paths_and_methods(spec)
         if total_paths == 1 and total_methods == 1:
-            return spec_copy  # FR-002 passthrough
+            return dict(spec)  # FR-002 passthrough
         raise FilteringError(
             "Your spec contains multiple endpoints but no filtering rules. "
             "Add [filtering] with path= and method= in config.ini."
@@ -104,9 +134,9 @@ def apply_filters(spec: Dict, rules: Dict[str, Optional[str]]):
     # With path provided, validate its existence
     if not path:
         # If neither path nor method -> treat as no rules (already handled above), but we re-check to be safe
-        total_paths, total_methods = _count_paths_and_methods(spec_copy)
+        total_paths, total_methods = _count_paths_and_methods(spec)
         if total_paths == 1 and total_methods == 1:
-            return spec_copy
+            return dict(spec)
         raise FilteringError(
             "Your spec contains multiple endpoints but the [filtering] path is missing. "
             "Add [filtering] with path= and method= in config.ini."
@@ -141,10 +171,10 @@ def apply_filters(spec: Dict, rules: Dict[str, Optional[str]]):
                 "Specify the correct path and method in the [filtering] section of config.ini"
             )  # FR-006
 
-    # Build a pruned spec:
+    # Build a pruned spec (shallow: untouched subtrees are shared with the input):
     new_spec = {}
     # Keep top-level fields intact (FR-008)
-    for k, v in spec_copy.items():
+    for k, v in spec.items():
         if k != "paths":
             new_spec[k] = v
 
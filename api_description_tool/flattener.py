@@ -4,32 +4,33 @@ Produces normalized rows for request/response body tables.
 
 Exports
 -------
-- resolve_ref(schema, components, ref_stack=None, ref_cache=None)
+- resolve_ref(schema, components, ref_stack=None, ref_cache=None, index=None)
+- ResolutionContext(components=None, document=None, cache_constraints=True) / ResolutionContext.for_spec(spec, **options)
 - extract_constraints(schema)
-- flatten_for_table(schema, components=None, base_path="", emit_array_item_row=False, max_depth=24)
+- flatten_for_table(schema, components=None, base_path="", emit_array_item_row=False, max_depth=DEFAULT_MAX_DEPTH, ctx=None)
+- iter_flattened_rows(...) — same arguments, yields the rows lazily
+Both take `row_type` (rows.BodyRow by default) as the row class to build.
 """
 from __future__ import annotations
 
-from typing import Dict, Iterable, List, Optional, Set, Tuple
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .refs import PointerIndex, component_ref, recursive_refs, resolve_pointer
+from .rows import BodyRow
 
 
 # -----------------------------
 # $ref resolution (cycle-safe)
 # -----------------------------
 
-def _lookup_ref(ref: str, components: Optional[dict]) -> Optional[dict]:
-    if not components or not ref.startswith("#/"):
-        return None
-    # Only support local component refs for now: #/components/schemas/Name
-    parts = ref.lstrip("#/").split("/")
-    node: dict = {"components": components}.get(parts[0]) if parts[0] == "components" else None
-    if node is None:
+def _lookup_ref(ref: str, components: Optional[dict], index: Optional[PointerIndex] = None) -> Optional[dict]:
+    if index is not None:
+        # Whole-document index: any local ref, RFC 6901 escapes included
+        return index.get(ref)
+    if not components or not ref.startswith("#/components/"):
         return None
-    for p in parts[1:]:
-        if not isinstance(node, dict) or p not in node:
-            return None
-        node = node[p]
-    return node
+    return resolve_pointer({"components": components}, ref)
 
 
 def resolve_ref(
@@ -37,9 +38,12 @@ def resolve_ref(
         components: Optional[dict],
         ref_stack: Optional[List[str]] = None,
         ref_cache: Optional[Dict[str, dict]] = None,
+        index: Optional[PointerIndex] = None,
 ) -> dict:
     """Resolve a local $ref. Uses a stack to prevent cycles and a cache for speed.
     Returns the *target schema* (not a deep copy). If cycle detected, returns a benign stub.
+    With a PointerIndex of the whole document, any local ref resolves in O(1);
+    without one, only '#/components/...' refs are looked up in `components`.
     """
     if not isinstance(schema, dict):
         return schema
@@ -60,20 +64,120 @@ def resolve_ref(
         ref_cache[ref] = stub
         return stub
 
-    target = _lookup_ref(ref, components)
+    target = _lookup_ref(ref, components, index)
     if target is None:
         # Unresolvable ref -> return as-is to avoid crashing; caller can still inspect $ref
         return schema
 
     ref_stack.append(ref)
     # Recurse to collapse chains like A -> B -> C
-    resolved = resolve_ref(target, components, ref_stack=ref_stack, ref_cache=ref_cache)
+    resolved = resolve_ref(target, components, ref_stack=ref_stack, ref_cache=ref_cache, index=index)
     ref_stack.pop()
 
     ref_cache[ref] = resolved
     return resolved
 
 
+class ResolutionContext:
+    """Per-spec $ref resolution state, created once per run and shared by every table
+    builder and flatten_for_table call, so each ref is looked up only once.
+    `hits` / `misses` count cache lookups for diagnostics. It also memoizes flattened
+    rows of non-recursive components (`flatten_memo`, `memo_hits` / `memo_misses`) and,
+    unless `cache_constraints=False`, constraint strings per schema object (`constraints()`),
+    plus merged allOf/oneOf/anyOf views per composite node (`merge_hits` / `merge_misses`).
+
+    A context is bound to one document; do not reuse it across specs. Given the whole
+    `document`, refs are looked up through a PointerIndex built on first use.
+    """
+
+    def __init__(
+            self,
+            components: Optional[dict] = None,
+            document: Optional[dict] = None,
+            *,
+            cache_constraints: bool = True,
+    ):
+        self.components = components or {}
+        self.document = document if document is not None else {"components": self.components}
+        self.ref_cache: Dict[str, dict] = {}
+        self.hits = 0
+        self.misses = 0
+        self._index: Optional[PointerIndex] = None
+        self._recursive: Optional[Set[str]] = None
+        # (ref, emit_array_item_row, inherited mandatory, row type) -> ((path suffix, row), ...), relative depth
+        self.flatten_memo: Dict[Tuple[str, bool, bool, type], Tuple[tuple, int]] = {}
+        self.memo_hits = 0
+        self.memo_misses = 0
+        # paths whose subtree was skipped because flatten_for_table hit its depth budget
+        self.depth_truncations: List[str] = []
+        # id(schema) -> (schema, constraint string); holding the schema keeps its id from being reused
+        self.constraint_cache: Optional[Dict[int, Tuple[dict, str]]] = {} if cache_constraints else None
+        self.constraint_hits = 0
+        self.constraint_misses = 0
+        # id(composite node) -> (node, merged allOf/oneOf/anyOf view, part refs), see _merge_composite
+        self.merge_cache: Dict[int, Tuple[dict, dict, Tuple[str, ...]]] = {}
+        self.merge_hits = 0
+        self.merge_misses = 0
+
+    @classmethod
+    def for_spec(cls, spec: Optional[dict], **options) -> "ResolutionContext":
+        return cls((spec or {}).get("components", {}), document=spec or {}, **options)
+
+    @property
+    def index(self) -> PointerIndex:
+        if self._index is None:
+            self._index = PointerIndex(self.document)
+        return self._index
+
+    @property
+    def recursive_refs(self) -> Set[str]:
+        """Ref targets on a $ref cycle, from one SCC pass over the document's ref graph."""
+        if self._recursive is None:
+            self._recursive = recursive_refs(self.document)
+        return self._recursive
+
+    def resolve(self, schema):
+        """Like resolve_ref(schema, components), falling back to `schema` for empty/unresolvable targets."""
+        if not isinstance(schema, dict) or "$ref" not in schema:
+            return schema
+        ref = schema["$ref"]
+        if ref in self.ref_cache:
+            self.hits += 1
+            return self.ref_cache[ref] or schema
+        self.misses += 1
+        return resolve_ref(
+            schema, self.components, ref_stack=[], ref_cache=self.ref_cache, index=self.index
+        ) or schema
+
+    def constraints(self, schema) -> str:
+        """extract_constraints(schema), computed once per schema object.
+        Shared schemas (ref targets, reused property schemas) are the same object on every
+        encounter, so their string, enum join included, is built once per run."""
+        cache = self.constraint_cache
+        if cache is None or not isinstance(schema, dict):
+            return extract_constraints(schema)
+        entry = cache.get(id(schema))
+        if entry is not None:
+            self.constraint_hits += 1
+            return entry[1]
+        self.constraint_misses += 1
+        text = extract_constraints(schema)
+        cache[id(schema)] = (schema, text)
+        return text
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "flatten_memo_hits": self.memo_hits,
+            "flatten_memo_misses": self.memo_misses,
+            "constraint_hits": self.constraint_hits,
+            "constraint_misses": self.constraint_misses,
+            "merge_hits": self.merge_hits,
+            "merge_misses": self.merge_misses,
+        }
+
+
 # -----------------------------
 # Constraint extraction
 # -----------------------------
@@ -86,6 +190,22 @@ def _fmt_num(x):
         return str(x)
 
 
+def _describe_additional_properties(value) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, dict):
+        ref = value.get("$ref")
+        if isinstance(ref, str) and ref:
+            part = ref.rsplit("/", 1)[-1]
+            return part or ref
+        inner_type = value.get("type")
+        if isinstance(inner_type, str) and inner_type:
+            return inner_type
+        if "enum" in value:
+            return "enum{" + ",".join(map(str, value.get("enum", []))) + "}"
+    return "object"
+
+
 def extract_constraints(schema: Optional[dict]) -> str:
     """Builds a compact constraint string for Expected Value(s).
     Examples: "string", "string enum=a,b", "integer min=1 max=10",
@@ -97,6 +217,7 @@ def extract_constraints(schema: Optional[dict]) -> str:
     s_type = schema.get("type")
     fmt = schema.get("format")
     pieces: List[str] = []
+    circular = schema.get("x-circular")
 
     # Special-case: enum without type
     if not s_type and "enum" in schema:
@@ -140,26 +261,12 @@ def extract_constraints(schema: Optional[dict]) -> str:
                     pieces.append(f"pattern={schema['pattern']}")
             if s_type == "object" and "additionalProperties" in schema:
                 ap = schema.get("additionalProperties")
-
-                def _describe_additional_properties(value) -> str:
-                    if isinstance(value, bool):
-                        return "true" if value else "false"
-                    if isinstance(value, dict):
-                        ref = value.get("$ref")
-                        if isinstance(ref, str) and ref:
-                            part = ref.rsplit("/", 1)[-1]
-                            return part or ref
-                        inner_type = value.get("type")
-                        if isinstance(inner_type, str) and inner_type:
-                            return inner_type
-                        if "enum" in value:
-                            return "enum{" + ",".join(map(str, value.get("enum", []))) + "}"
-                    return "object"
-
                 pieces.append(f"additionalProperties={_describe_additional_properties(ap)}")
         # Enums apply at any level
         if "enum" in schema and s_type != "array":
             pieces.append("enum=" + ",".join(map(str, schema.get("enum", []))))
+    if isinstance(circular, str) and circular:
+        pieces.append("circular=" + circular.rsplit("/", 1)[-1])
 
     return " ".join(pieces).strip()
 
@@ -198,17 +305,103 @@ def _iter_object_properties(schema: dict) -> Iterable[Tuple[str, dict, bool, str
         yield name, sub, name in required, str((sub or {}).get("description", ""))
 
 
+_PRIMITIVE_TYPES = {"string", "integer", "number", "boolean", "null"}
+DEFAULT_MAX_DEPTH = 24
+
+# Task tags for the explicit stack in iter_flattened_rows (rows are pushed as row objects, tasks as tuples)
+_WALK = 0
+_MEMO_END = 1
+
+
+def _merge_composite(s: dict, ctx: "ResolutionContext") -> Tuple[dict, Tuple[str, ...]]:
+    """Merged view of an allOf/oneOf/anyOf node (see _merge_parts) and the component_ref() of
+    every part $ref it merged, built once per node object and shared by every later visit;
+    (`s`, ()) when it is not a composite."""
+    if "allOf" not in s and "oneOf" not in s and "anyOf" not in s:
+        return s, ()
+    entry = ctx.merge_cache.get(id(s))
+    if entry is not None:
+        ctx.merge_hits += 1
+        return entry[1], entry[2]
+    ctx.merge_misses += 1
+    merged, part_refs = _merge_parts(s, ctx)
+    ctx.merge_cache[id(s)] = (s, merged, part_refs)
+    return merged, part_refs
+
+
+def _merge_parts(s: dict, ctx: "ResolutionContext") -> Tuple[dict, Tuple[str, ...]]:
+    """Merge allOf/oneOf/anyOf minimally: properties + required (+ a few plain constraints).
+    Also returns the refs of the merged parts, so the walker can stop at recursive ones."""
+    for comb in ("allOf", "oneOf", "anyOf"):
+        if comb in s and isinstance(s[comb], list) and s[comb]:
+            # try to merge minimal essential bits: properties + required
+            merged: dict = {"type": s.get("type")}
+            props: dict = {}
+            req: List[str] = []
+            part_refs: List[str] = []
+            for part in s[comb]:
+                if "$ref" in part:
+                    if isinstance(part["$ref"], str):
+                        part_refs.append(component_ref(part["$ref"]))
+                    part = ctx.resolve(part)
+                props.update(part.get("properties", {}))
+                if part.get("required"):
+                    req.extend(part.get("required"))
+            if props:
+                merged["properties"] = props
+            if req:
+                merged["required"] = list(dict.fromkeys(req))
+            # keep other constraints/types if present
+            for k in ("type", "items", "minItems", "maxItems", "enum", "format", "minimum", "maximum", "minLength", "maxLength", "pattern"):
+                if k in s and k not in merged:
+                    merged[k] = s[k]
+            return merged, tuple(dict.fromkeys(part_refs))
+    return s, ()
+
+
+def _is_primitive_items(items) -> bool:
+    return isinstance(items, dict) and (items.get("type") in _PRIMITIVE_TYPES or "enum" in items)
+
+
 def flatten_for_table(
         schema: Optional[dict],
         components: Optional[dict] = None,
         base_path: str = "",
         *,
         emit_array_item_row: bool = False,
-        max_depth: int = 24,
-) -> List[Dict[str, object]]:
-    """Flatten an OpenAPI/JSON Schema into table rows.
+        max_depth: Optional[int] = DEFAULT_MAX_DEPTH,
+        ctx: Optional[ResolutionContext] = None,
+        row_type: type = BodyRow,
+) -> List[BodyRow]:
+    """List form of iter_flattened_rows()."""
+    return list(
+        iter_flattened_rows(
+            schema,
+            components,
+            base_path,
+            emit_array_item_row=emit_array_item_row,
+            max_depth=max_depth,
+            ctx=ctx,
+            row_type=row_type,
+        )
+    )
+
+
+def iter_flattened_rows(
+        schema: Optional[dict],
+        components: Optional[dict] = None,
+        base_path: str = "",
+        *,
+        emit_array_item_row: bool = False,
+        max_depth: Optional[int] = DEFAULT_MAX_DEPTH,
+        ctx: Optional[ResolutionContext] = None,
+        row_type: type = BodyRow,
+) -> Iterator[BodyRow]:
+    """Flatten an OpenAPI/JSON Schema into table rows, yielded in table order.
 
-    Returns a list of dicts with keys: Path, Property, Mandatory, Expected Value(s), Description, Examples.
+    Yields `row_type` rows (rows.BodyRow by default; rows.ResponseRow adds an empty Status):
+    Path, Property, Mandatory, Expected Value(s), Description, Examples.
+    Every row is a fresh object the caller may update in place (e.g. fill in Status).
 
     Rules:
     - Objects: list each property as a row (no row for the object container itself).
@@ -216,154 +409,234 @@ def flatten_for_table(
         * arrays of **primitives**: optionally emit a row at path "<base>/<prop>[0]" with empty Property.
         * arrays of **objects**: descend into the object with path "<base>/<prop>[0]".
     - $ref: resolved safely, with cycles broken via a stub.
-    - Depth is capped to avoid pathological recursion.
+    - Recursive components (found once per context by SCC analysis of the $ref graph) are
+      expanded once per path; the re-entry point becomes a single row marked "circular=<Name>".
+    - Depth is a soft budget (`max_depth`, None for unlimited): subtrees below it are skipped and
+      their paths recorded in `ctx.depth_truncations` so callers can report them. Without a
+      budget, re-entering a schema object already on the path (e.g. a YAML self-alias) also
+      yields a "circular" row.
+    - Rows of a non-recursive component are computed once per
+      (ref, emit_array_item_row, inherited mandatory) and rebased onto each later occurrence.
+    Pass a shared `ctx` to reuse $ref resolutions and flattened components across calls
+    (it supersedes `components`).
+
+    The traversal is iterative: an explicit LIFO of tasks (row objects, walk tuples and memo
+    markers) replays the depth-first order of a recursive walk without Python call frames.
+    Only rows of components still being memoized are retained, so memory does not grow
+    with the number of rows produced.
     """
     if not isinstance(schema, dict):
-        return []
-
-    results: List[Dict[str, object]] = []
-    ref_cache: Dict[str, dict] = {}
-
-    def walk(
-            s: dict,
-            path: str,
-            *,
-            depth: int,
-            inherited_array_mandatory: bool,
-    ) -> None:
-        if depth > max_depth:
-            return
+        return
+
+    if ctx is None:
+        ctx = ResolutionContext(components)
+    recursive = ctx.recursive_refs
+    memo = ctx.flatten_memo
+    resolve = ctx.resolve
+    constraints = ctx.constraints
+    budget = sys.maxsize if max_depth is None else max_depth
+
+    # copies of the rows emitted while at least one component is being memoized
+    recorded: List[BodyRow] = []
+    record = recorded.append
+    open_memos = 0
+    # deepest level reached / whether the budget cut anything, for the subtree being memoized
+    deepest = 0
+    truncated = False
+
+    # (_WALK, schema, path, depth, inherited mandatory, active recursive refs, ref that led here,
+    #  ids of the schemas on the walk path - only tracked when the depth budget is unlimited)
+    # (_MEMO_END, memo key, path, first result index, depth, outer deepest, outer truncated)
+    stack: list = [(_WALK, schema, base_path, 0, False, frozenset(), None, frozenset())]
+    pop = stack.pop
+    push = stack.append
+    while stack:
+        task = pop()
+        if type(task) is not tuple:
+            if open_memos:
+                record(task.copy())
+            yield task
+            continue
+        if task[0] == _MEMO_END:
+            _, key, path, start, depth, outer_deepest, outer_truncated = task
+            if not truncated:
+                # rows of a subtree always start with its path; keep only the relative suffix
+                cut = len(path)
+                memo[key] = (tuple((row.path[cut:], row) for row in recorded[start:]), deepest - depth)
+            open_memos -= 1
+            if not open_memos:
+                recorded.clear()
+            deepest = max(outer_deepest, deepest)
+            truncated = outer_truncated or truncated
+            continue
+
+        _, s, path, depth, mandatory, active, ref, on_path = task
+        if depth > budget:
+            truncated = True
+            ctx.depth_truncations.append(path)
+            continue
+        if depth > deepest:
+            deepest = depth
         # collapse $ref chains early
         if "$ref" in s:
-            s = resolve_ref(s, components, ref_stack=[], ref_cache=ref_cache) or s
+            ref = s["$ref"]
+            s = resolve(s)
+        if isinstance(ref, str):
+            entry = component_ref(ref)
+            if entry in recursive:
+                # Recursive component already being expanded on this path: stop here with a marker row
+                if entry in active:
+                    push(
+                        row_type(
+                            path,
+                            "",
+                            mandatory,
+                            extract_constraints({"type": "object", "x-circular": entry}),
+                            str(s.get("description", "")),
+                            "",
+                        )
+                    )
+                    continue
+                active = active | {entry}
+            elif path:
+                # Non-recursive component below the root: its rows do not depend on the
+                # ancestors, so reuse them rebased onto this path (see ResolutionContext.flatten_memo)
+                key = (ref, emit_array_item_row, mandatory, row_type)
+                cached = memo.get(key)
+                if cached is not None and depth + cached[1] <= budget:
+                    ctx.memo_hits += 1
+                    stack.extend(row.rebased(path + suffix) for suffix, row in reversed(cached[0]))
+                    deepest = max(deepest, depth + cached[1])
+                    continue
+                ctx.memo_misses += 1
+                push((_MEMO_END, key, path, len(recorded), depth, deepest, truncated))
+                open_memos += 1
+                deepest, truncated = depth, False
+
+        if max_depth is None:
+            # Without a budget nothing else stops cycles the ref graph cannot see (e.g. YAML
+            # self-aliases); re-entering a schema already on this path ends with a marker row
+            if id(s) in on_path:
+                truncated = True  # rows depend on the ancestors, do not memoize them
+                push(
+                    row_type(
+                        path,
+                        "",
+                        mandatory,
+                        extract_constraints({"type": "object", "x-circular": component_ref(ref) if ref else path}),
+                        str(s.get("description", "")),
+                        "",
+                    )
+                )
+                continue
+            on_path = on_path | {id(s)}
 
         # Handle composed schemas minimally (prefer first viable branch)
-        for comb in ("allOf", "oneOf", "anyOf"):
-            if comb in s and isinstance(s[comb], list) and s[comb]:
-                # try to merge minimal essential bits: properties + required
-                merged: dict = {"type": s.get("type")}
-                props: dict = {}
-                req: List[str] = []
-                for part in s[comb]:
-                    if "$ref" in part:
-                        part = resolve_ref(part, components, ref_stack=[], ref_cache=ref_cache) or part
-                    props.update(part.get("properties", {}))
-                    if part.get("required"):
-                        req.extend(part.get("required"))
-                if props:
-                    merged["properties"] = props
-                if req:
-                    merged["required"] = list(dict.fromkeys(req))
-                # keep other constraints/types if present
-                for k in ("type", "items", "minItems", "maxItems", "enum", "format", "minimum", "maximum", "minLength", "maxLength", "pattern"):
-                    if k in s and k not in merged:
-                        merged[k] = s[k]
-                s = merged
-                break
+        merged, part_refs = _merge_composite(s, ctx)
+        # Parts that $ref a recursive component expand it just like a direct $ref would
+        part_refs = [entry for entry in part_refs if entry in recursive]
+        if part_refs:
+            reentered = next((entry for entry in part_refs if entry in active), None)
+            if reentered is not None:
+                push(
+                    row_type(
+                        path,
+                        "",
+                        mandatory,
+                        extract_constraints({"type": "object", "x-circular": reentered}),
+                        str(s.get("description", "")),
+                        "",
+                    )
+                )
+                continue
+            active = active.union(part_refs)
+        s = merged
 
+        # Children are collected in document order, then pushed reversed so they pop in order
+        children: list = []
         if _is_object(s):
             for prop, sub, is_req, desc in _iter_object_properties(s):
                 # resolve property $ref
+                sub_ref = None
                 if isinstance(sub, dict) and "$ref" in sub:
-                    sub = resolve_ref(sub, components, ref_stack=[], ref_cache=ref_cache) or sub
+                    sub_ref = sub["$ref"]
+                    sub = resolve(sub)
 
-                row_mandatory = bool(is_req) or inherited_array_mandatory
+                row_mandatory = bool(is_req) or mandatory
                 # primitives -> row
-                if isinstance(sub, dict) and sub.get("type") in {"string", "integer", "number", "boolean", "null"} or (
+                if isinstance(sub, dict) and sub.get("type") in _PRIMITIVE_TYPES or (
                         isinstance(sub, dict) and "enum" in sub and sub.get("type") != "array"
                 ):
-                    results.append(
-                        {
-                            "Path": path,
-                            "Property": prop,
-                            "Mandatory": row_mandatory,
-                            "Expected Value(s)": extract_constraints(sub),
-                            "Description": desc,
-                            "Examples": _examples_from(sub),
-                        }
+                    children.append(
+                        row_type(
+                            path,
+                            prop,
+                            row_mandatory,
+                            constraints(sub),
+                            desc,
+                            _examples_from(sub),
+                        )
                     )
                 elif isinstance(sub, dict) and sub.get("type") == "array":
                     items = sub.get("items") or {}
-                    array_mandatory = row_mandatory or (isinstance(sub, dict) and sub.get("minItems", 0) > 0)
+                    array_mandatory = row_mandatory or sub.get("minItems", 0) > 0
+                    next_path = f"{path}/{prop}[0]"
                     # row for primitives-in-array (optional)
-                    if emit_array_item_row and isinstance(items, dict) and (
-                            items.get("type") in {"string", "integer", "number", "boolean", "null"} or "enum" in items
-                    ):
-                        results.append(
-                            {
-                                "Path": f"{path}/{prop}[0]" if path else f"/{prop}[0]",
-                                "Property": "",
-                                "Mandatory": array_mandatory,
-                                "Expected Value(s)": extract_constraints(items),
-                                "Description": desc,
-                                "Examples": _examples_from(items) or _examples_from(sub),
-                            }
+                    if emit_array_item_row and _is_primitive_items(items):
+                        children.append(
+                            row_type(
+                                next_path,
+                                "",
+                                array_mandatory,
+                                constraints(items),
+                                desc,
+                                _examples_from(items) or _examples_from(sub),
+                            )
                         )
                     # descend into object items
-                    next_path = f"{path}/{prop}[0]" if path else f"/{prop}[0]"
                     if isinstance(items, dict):
+                        items_ref = None
                         if "$ref" in items:
-                            items = resolve_ref(items, components, ref_stack=[], ref_cache=ref_cache) or items
-                        if isinstance(items, dict) and (
-                                _is_object(items) or items.get("type") == "array"
-                        ):
-                            walk(
-                                items,
-                                next_path,
-                                depth=depth + 1,
-                                inherited_array_mandatory=array_mandatory,
-                            )
-                else:
+                            items_ref = items["$ref"]
+                            items = resolve(items)
+                        if isinstance(items, dict) and (_is_object(items) or items.get("type") == "array"):
+                            children.append((_WALK, items, next_path, depth + 1, array_mandatory, active, items_ref, on_path))
+                elif isinstance(sub, dict):
                     # object-ish (no primitive type), descend
-                    next_path = f"{path}/{prop}" if path else f"/{prop}"
-                    if isinstance(sub, dict):
-                        walk(
-                            sub,
-                            next_path,
-                            depth=depth + 1,
-                            inherited_array_mandatory=inherited_array_mandatory,
-                        )
+                    children.append((_WALK, sub, f"{path}/{prop}", depth + 1, mandatory, active, sub_ref, on_path))
         elif s.get("type") == "array":
             items = s.get("items") or {}
             item_path = f"{path}[0]" if path else "/[0]"
-            array_mandatory = inherited_array_mandatory or (isinstance(s, dict) and s.get("minItems", 0) > 0)
-            if emit_array_item_row and isinstance(items, dict) and (
-                    items.get("type") in {"string", "integer", "number", "boolean", "null"} or "enum" in items
-            ):
-                results.append(
-                    {
-                        "Path": item_path,
-                        "Property": "",
-                        "Mandatory": array_mandatory,
-                        "Expected Value(s)": extract_constraints(items),
-                        "Description": str(s.get("description", "")),
-                        "Examples": _examples_from(items) or _examples_from(s),
-                    }
+            array_mandatory = mandatory or s.get("minItems", 0) > 0
+            if emit_array_item_row and _is_primitive_items(items):
+                children.append(
+                    row_type(
+                        item_path,
+                        "",
+                        array_mandatory,
+                        constraints(items),
+                        str(s.get("description", "")),
+                        _examples_from(items) or _examples_from(s),
+                    )
                 )
             if isinstance(items, dict):
+                items_ref = None
                 if "$ref" in items:
-                    items = resolve_ref(items, components, ref_stack=[], ref_cache=ref_cache) or items
-                if isinstance(items, dict) and (
-                        _is_object(items) or items.get("type") == "array"
-                ):
-                    walk(
-                        items,
-                        item_path,
-                        depth=depth + 1,
-                        inherited_array_mandatory=array_mandatory,
-                    )
+                    items_ref = items["$ref"]
+                    items = resolve(items)
+                if isinstance(items, dict) and (_is_object(items) or items.get("type") == "array"):
+                    children.append((_WALK, items, item_path, depth + 1, array_mandatory, active, items_ref, on_path))
         else:
             # primitive at root -> single row
-            results.append(
-                {
-                    "Path": path,
-                    "Property": "",
-                    "Mandatory": False,
-                    "Expected Value(s)": extract_constraints(s),
-                    "Description": str(s.get("description", "")),
-                    "Examples": _examples_from(s),
-                }
+            children.append(
+                row_type(
+                    path,
+                    "",
+                    False,
+                    constraints(s),
+                    str(s.get("description", "")),
+                    _examples_from(s),
+                )
             )
-
-    walk(schema, base_path, depth=0, inherited_array_mandatory=False)
-    return results
+        children.reverse()
+        stack.extend(children)
@@ -0,0 +1,123 @@
+"""
+Incremental build manifest.
+A JSON file next to the outputs records, per output base, a fingerprint of everything
+that determines its content (input spec bytes, effective config sections, tool version,
+run mode) plus the files written. A rerun with the same fingerprint whose files all
+still exist can be skipped.
+
+Exports
+-------
+- MANIFEST_NAME
+- build_fingerprint(input_digest, cfg, **extra)
+- Manifest(directory)
+"""
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Union
+
+from . import __version__
+
+
+MANIFEST_NAME = ".api_desc_manifest.json"
+LOCK_SUFFIX = ".lock"
+# a lock held longer than this is assumed to be left behind by a crashed process
+LOCK_STALE_SECONDS = 30.0
+FINGERPRINT_SECTIONS = ("input", "output", "filtering", "tables")
+# options that change how outputs are built (or only apply to stdout), never what the files contain
+FINGERPRINT_IGNORED = {("tables", "workers"), ("tables", "parallel_min_operations"), ("output", "stdout_table")}
+
+
+def build_fingerprint(input_digest: str, cfg: dict, **extra) -> str:
+    """Hash of the input content hash, the config sections that shape outputs,
+    the tool version and any extra run options (e.g. all_operations=True)."""
+    cfg = cfg if isinstance(cfg, dict) else {}
+    payload = {
+        "input": input_digest,
+        "config": {
+            name: {k: v for k, v in sorted((cfg.get(name) or {}).items()) if (name, k) not in FINGERPRINT_IGNORED}
+            for name in FINGERPRINT_SECTIONS
+        },
+        "version": __version__,
+        "extra": dict(sorted(extra.items())),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class Manifest:
+    """Manifest of one output directory. Output paths are stored relative to that directory."""
+
+    def __init__(self, directory: Union[str, Path]):
+        self.dir = Path(directory)
+        self.path = self.dir / MANIFEST_NAME
+        self.entries: Dict[str, dict] = self._read()
+
+    def _read(self) -> Dict[str, dict]:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        entries = data.get("outputs") if isinstance(data, dict) else None
+        return entries if isinstance(entries, dict) else {}
+
+    def is_fresh(self, key: str, fingerprint: str) -> bool:
+        entry = self.entries.get(key)
+        if not isinstance(entry, dict) or entry.get("fingerprint") != fingerprint:
+            return False
+        files = entry.get("files") or []
+        return bool(files) and all((self.dir / f).exists() for f in files)
+
+    def record(self, key: str, fingerprint: str, files: List[Union[str, Path]]) -> None:
+        rel = [os.path.relpath(Path(f).resolve(), self.dir.resolve()) for f in files]
+        self.entries[key] = {"fingerprint": fingerprint, "files": rel}
+
+    @contextlib.contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold <manifest>.lock (created with O_EXCL, so it works across processes and platforms)."""
+        lock = self.path.with_name(self.path.name + LOCK_SUFFIX)
+        while True:
+            try:
+                fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                try:
+                    if time.time() - lock.stat().st_mtime > LOCK_STALE_SECONDS:
+                        os.unlink(lock)
+                        continue
+                except OSError:
+                    continue  # released meanwhile
+                time.sleep(0.01)
+        try:
+            os.close(fd)
+            yield
+        finally:
+            try:
+                os.unlink(lock)
+            except OSError:
+                pass
+
+    def save(self) -> None:
+        """Atomically write the manifest, merging entries other processes saved meanwhile.
+        The read-merge-replace runs under a lock file so concurrent savers never drop each other's entries."""
+        self.dir.mkdir(parents=True, exist_ok=True)
+        with self._locked():
+            merged = self._read()
+            merged.update(self.entries)
+            self.entries = merged
+            fd, tmp = tempfile.mkstemp(dir=self.dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump({"version": __version__, "outputs": merged}, f, indent=2, sort_keys=True)
+                os.replace(tmp, self.path)
+            except BaseException:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+                raise
@@ -1,28 +1,94 @@
 import yaml
+from importlib.metadata import PackageNotFoundError, version
 from pathlib import Path
+from typing import Optional
+
 from openapi_spec_validator import validate_spec
 from openapi_spec_validator.validation.exceptions import (
     OpenAPIValidationError,
     ValidatorDetectError,
 )
 
+from api_description_tool.cache import DiskCache, file_digest, get_or_load, spec_fingerprint
+from api_description_tool.refs import prune_components, reachable_refs
+
+
+# YAML loader engines: "libyaml" (C accelerated) is only available when PyYAML
+# was built against libyaml; "python" is the pure-Python SafeLoader.
+YAML_ENGINES = ("auto", "libyaml", "python")
+LIBYAML_AVAILABLE = bool(getattr(yaml, "__with_libyaml__", False)) and hasattr(yaml, "CSafeLoader")
+
+
+def resolve_yaml_engine(engine: str = "auto") -> str:
+    """Return the concrete engine name ("libyaml" or "python") for a requested engine.
+    "auto" picks libyaml when available and falls back to python otherwise.
+    Raises ValueError for unknown engines or when libyaml is requested but missing.
+    """
+    name = (engine or "auto").strip().lower()
+    if name not in YAML_ENGINES:
+        raise ValueError(f"Unsupported YAML engine: {engine} (expected one of: {', '.join(YAML_ENGINES)})")
+    if name == "auto":
+        return "libyaml" if LIBYAML_AVAILABLE else "python"
+    if name == "libyaml" and not LIBYAML_AVAILABLE:
+        raise ValueError("YAML engine 'libyaml' requested but PyYAML was built without libyaml")
+    return name
+
 
-def load_yaml(file_path: str) -> dict:
-    """Load YAML file into Python dict."""
+def _loader_for(engine: str):
+    return yaml.CSafeLoader if engine == "libyaml" else yaml.SafeLoader
+
+
+def load_yaml(file_path: str, engine: str = "auto", cache: Optional[DiskCache] = None) -> dict:
+    """Load YAML file into Python dict.
+    `engine` selects the loader (see resolve_yaml_engine); both engines return identical data.
+    With a `cache`, the parsed result is reused for files whose content hash is unchanged.
+    """
     p = Path(file_path)
     if not p.exists():
         raise FileNotFoundError(f"YAML file not found: {file_path}")
-    with p.open("r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+    loader = _loader_for(resolve_yaml_engine(engine))
+    data = p.read_bytes()
+    return get_or_load(
+        cache,
+        file_digest(data),
+        lambda: yaml.load(data.decode("utf-8"), Loader=loader),
+    )
+
+
+def _validator_version() -> str:
+    try:
+        return version("openapi-spec-validator")
+    except PackageNotFoundError:
+        return "unknown"
 
 
-def validate_openapi(spec: dict) -> bool:
+def validate_openapi(spec: dict, cache: Optional[DiskCache] = None, scoped: bool = False) -> bool:
     """Validate that spec meets OpenAPI 3.x using openapi-spec-validator.
     Raises ValueError if invalid.
+    With a `cache`, the outcome (pass, or the error message) is remembered per spec
+    fingerprint, so an unchanged spec skips the validator and fails with the same message.
+    With `scoped=True`, only the paths plus the components transitively reachable from them
+    are validated; unused components are neither checked nor part of the cache key.
     """
+    if scoped and isinstance(spec, dict):
+        spec = prune_components(spec, reachable_refs(spec))
+    key = None
+    if cache is not None:
+        key = f"{_validator_version()}-{spec_fingerprint(spec)}"
+        outcome = cache.get(key)
+        if outcome is not None:
+            ok, message = outcome
+            if not ok:
+                raise ValueError(message)
+            return True
     try:
         validate_spec(spec)
-        return True
     except (OpenAPIValidationError, ValidatorDetectError) as e:
         # Normalize validator exceptions into ValueError for callers/tests
-        raise ValueError(f"OpenAPI validation failed: {e}") from e
\ No newline at end of file
+        message = f"OpenAPI validation failed: {e}"
+        if cache is not None:
+            cache.put(key, (False, message))
+        raise ValueError(message) from e
+    if cache is not None:
+        cache.put(key, (True, ""))
+    return True
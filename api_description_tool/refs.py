@@ -0,0 +1,306 @@
+"""
+Local $ref handling for OpenAPI documents: RFC 6901 pointer resolution and indexing,
+reachability of `components` from a set of roots (scoped validation, tree-shaking of
+filtered specs) and the $ref graph whose cycles mark recursive schemas.
+
+Exports
+-------
+- escape_pointer_token(token) / unescape_pointer_token(token)
+- resolve_pointer(document, ref)
+- PointerIndex(document)
+- iter_refs(node)
+- reachable_refs(spec, roots=None)
+- reachable_components(spec, roots=None)
+- component_ref(ref)
+- ref_tokens(ref)
+- prune_components(spec, refs)
+- ref_graph(spec)
+- strongly_connected_components(graph)
+- recursive_refs(spec)
+"""
+from __future__ import annotations
+
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+from urllib.parse import unquote
+
+
+# components sections whose entries are addressed by $ref; anything else
+# (e.g. securitySchemes, referenced by name) is kept as-is when pruning
+REF_SECTIONS = (
+    "schemas",
+    "responses",
+    "parameters",
+    "examples",
+    "requestBodies",
+    "headers",
+    "links",
+    "callbacks",
+    "pathItems",
+)
+
+
+def escape_pointer_token(token) -> str:
+    """RFC 6901: '~' -> '~0', '/' -> '~1'. Non-string keys (e.g. YAML int status codes) use str()."""
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+
+def unescape_pointer_token(token: str) -> str:
+    """RFC 6901: '~1' -> '/', then '~0' -> '~'."""
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def _split_ref(ref: str) -> Optional[List[str]]:
+    if not isinstance(ref, str) or not ref.startswith("#"):
+        return None
+    pointer = unquote(ref[1:])
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        return None
+    return [unescape_pointer_token(t) for t in pointer[1:].split("/")]
+
+
+def resolve_pointer(document, ref: str):
+    """Return the node a local ref ('#/...') points to, or None when it does not resolve."""
+    tokens = _split_ref(ref)
+    if tokens is None:
+        return None
+    node = document
+    for t in tokens:
+        if isinstance(node, dict):
+            if t in node:
+                node = node[t]
+            elif t.isdigit() and int(t) in node:
+                node = node[int(t)]  # YAML loads unquoted status codes as ints
+            else:
+                return None
+        elif isinstance(node, list):
+            if not t.isdigit() or int(t) >= len(node):
+                return None
+            node = node[int(t)]
+        else:
+            return None
+    return node
+
+
+class PointerIndex:
+    """Every JSON Pointer of a document mapped to its node, built once with an iterative walk.
+    get(ref) is then a dict hit for any local ref ('#/components/...', '#/paths/~1pets/...'),
+    including RFC 6901 escapes and percent-encoded fragments.
+    """
+
+    def __init__(self, document):
+        self.document = document
+        self._nodes: Dict[str, object] = {}
+        stack = [("", document)]
+        expanded: Set[int] = set()
+        while stack:
+            pointer, node = stack.pop()
+            self._nodes.setdefault(pointer, node)
+            if not isinstance(node, (dict, list)) or id(node) in expanded:
+                # YAML aliases may share (or even nest) containers; expand each once
+                continue
+            expanded.add(id(node))
+            items = node.items() if isinstance(node, dict) else enumerate(node)
+            for k, v in items:
+                stack.append((f"{pointer}/{escape_pointer_token(k)}", v))
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def get(self, ref: str):
+        """Node for a local ref, or None when it does not resolve."""
+        if not isinstance(ref, str) or not ref.startswith("#"):
+            return None
+        fragment = ref[1:]
+        node = self._nodes.get(fragment)
+        if node is None and "%" in fragment:
+            node = self._nodes.get(unquote(fragment))
+        if node is None:
+            # Pointers only reachable through a second alias of a shared node
+            node = resolve_pointer(self.document, ref)
+        return node
+
+
+def iter_refs(node) -> Iterator[str]:
+    """Yield every local `$ref` string found anywhere under `node` (iterative walk).
+    Containers shared through YAML aliases are walked once, so self-aliases terminate."""
+    stack = [node]
+    expanded: Set[int] = set()
+    while stack:
+        cur = stack.pop()
+        if id(cur) in expanded:
+            continue
+        expanded.add(id(cur))
+        if isinstance(cur, dict):
+            ref = cur.get("$ref")
+            if isinstance(ref, str) and ref.startswith("#"):
+                yield ref
+            stack.extend(v for v in cur.values() if isinstance(v, (dict, list)))
+        elif isinstance(cur, list):
+            stack.extend(v for v in cur if isinstance(v, (dict, list)))
+
+
+def _component_root(ref: str) -> str:
+    """Map '#/components/schemas/A/properties/b' to its entry '#/components/schemas/A'.
+    Other local refs are returned in canonical form (percent-decoding undone, RFC 6901 escapes kept)."""
+    tokens = _split_ref(ref)
+    if tokens is None:
+        return ref
+    if len(tokens) > 3 and tokens[0] == "components":
+        tokens = tokens[:3]
+    return "#" + "".join("/" + escape_pointer_token(t) for t in tokens)
+
+
+def reachable_refs(spec: dict, roots: Optional[Iterable] = None) -> Set[str]:
+    """Transitive closure of local refs reachable from `roots` (default: the spec's `paths`).
+    Refs into the middle of a component count as reaching the whole component entry.
+    Unresolvable refs are included as-is; cycles are handled.
+    """
+    if roots is None:
+        roots = [(spec or {}).get("paths") or {}]
+    seen: Set[str] = set()
+    pending = [ref for root in roots for ref in iter_refs(root)]
+    while pending:
+        ref = _component_root(pending.pop())
+        if ref in seen:
+            continue
+        seen.add(ref)
+        target = resolve_pointer(spec, ref)
+        if target is not None:
+            pending.extend(iter_refs(target))
+    return seen
+
+
+def reachable_components(spec: dict, roots: Optional[Iterable] = None) -> Dict[str, Set[str]]:
+    """Group reachable component entries by section, e.g. {"schemas": {"Pet", "Owner"}}.
+    Handy for impact analysis: which components does an operation depend on?
+    """
+    out: Dict[str, Set[str]] = {}
+    for ref in reachable_refs(spec, roots):
+        tokens = _split_ref(ref)
+        if tokens and len(tokens) >= 3 and tokens[0] == "components":
+            out.setdefault(tokens[1], set()).add(tokens[2])
+    return out
+
+
+def prune_components(spec: dict, refs: Iterable[str]) -> dict:
+    """Return a shallow copy of `spec` whose ref-addressable components are limited to `refs`.
+    The input is not mutated; kept component entries are shared, not copied.
+    """
+    components = (spec or {}).get("components")
+    if not isinstance(components, dict):
+        return spec
+    keep: Dict[str, Set[str]] = {}
+    for ref in refs:
+        tokens = _split_ref(ref)
+        if tokens and len(tokens) >= 3 and tokens[0] == "components":
+            keep.setdefault(tokens[1], set()).add(tokens[2])
+
+    pruned = {}
+    for section, entries in components.items():
+        if section in REF_SECTIONS and isinstance(entries, dict):
+            names = keep.get(section, set())
+            kept = {name: v for name, v in entries.items() if name in names}
+            if kept:
+                pruned[section] = kept
+        else:
+            pruned[section] = entries
+
+    out = dict(spec)
+    out["components"] = pruned
+    return out
+
+
+def component_ref(ref: str) -> str:
+    """Public form of the component-entry normalisation used by the graph helpers."""
+    return _component_root(ref)
+
+
+def ref_tokens(ref: str) -> Optional[List[str]]:
+    """Decoded RFC 6901 tokens of a local ref ('#/paths/~1a' -> ['paths', '/a']), or None
+    when `ref` is not a local JSON Pointer."""
+    return _split_ref(ref)
+
+
+def ref_graph(spec: dict) -> Dict[str, Set[str]]:
+    """$ref dependency graph of the whole document: each component entry
+    ('#/components/<section>/<name>') and every other local ref target (e.g. '#/paths/~1a/get/...')
+    -> the refs found under it, normalised with component_ref()."""
+    graph: Dict[str, Set[str]] = {}
+    pending: List[str] = []
+    components = (spec or {}).get("components") or {}
+    for section in REF_SECTIONS:
+        entries = components.get(section)
+        if isinstance(entries, dict):
+            pending.extend(f"#/components/{section}/{escape_pointer_token(name)}" for name in entries)
+    pending.extend(_component_root(r) for r in iter_refs(spec or {}))
+    while pending:
+        key = pending.pop()
+        if key in graph:
+            continue
+        target = resolve_pointer(spec, key)
+        graph[key] = {_component_root(r) for r in iter_refs(target)} if target is not None else set()
+        pending.extend(graph[key])
+    return graph
+
+
+def strongly_connected_components(graph: Dict[str, Set[str]]) -> List[List[str]]:
+    """Tarjan's algorithm, iterative (no recursion limit on long ref chains).
+    Components are returned in reverse topological order."""
+    index: Dict[str, int] = {}
+    low: Dict[str, int] = {}
+    on_stack: Set[str] = set()
+    stack: List[str] = []
+    out: List[List[str]] = []
+    counter = 0
+
+    for root in graph:
+        if root in index:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(sorted(graph.get(root, ()))))]
+        while work:
+            node, edges = work[-1]
+            descended = False
+            for nxt in edges:
+                if nxt not in index:
+                    index[nxt] = low[nxt] = counter
+                    counter += 1
+                    stack.append(nxt)
+                    on_stack.add(nxt)
+                    work.append((nxt, iter(sorted(graph.get(nxt, ())))))
+                    descended = True
+                    break
+                if nxt in on_stack:
+                    low[node] = min(low[node], index[nxt])
+            if descended:
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+            if low[node] == index[node]:
+                scc = []
+                while True:
+                    w = stack.pop()
+                    on_stack.discard(w)
+                    scc.append(w)
+                    if w == node:
+                        break
+                out.append(scc)
+    return out
+
+
+def recursive_refs(spec: dict) -> Set[str]:
+    """Ref targets that take part in a $ref cycle (SCC of size > 1, or a self-reference).
+    Compare with component_ref(ref)."""
+    graph = ref_graph(spec)
+    out: Set[str] = set()
+    for scc in strongly_connected_components(graph):
+        if len(scc) > 1 or scc[0] in graph.get(scc[0], ()):
+            out.update(scc)
+    return out
@@ -0,0 +1,129 @@
+"""
+Compact table rows.
+One slotted class per table kind with a fixed column schema (HEADERS, the sheet/CSV column
+order). Rows hold their cells as attributes instead of a per-row dict of repeated keys,
+and stay read/write Mappings over the header names so dict-style callers keep working.
+
+Exports
+-------
+- ParamRow(name, mandatory, expected, in_, description, examples)
+- BodyRow(path, prop, mandatory, expected, description, examples)
+- ResponseRow(path, prop, mandatory, expected, description, examples, status="")
+- row_values(row, headers)
+"""
+from __future__ import annotations
+
+from collections.abc import Mapping
+from operator import attrgetter
+from typing import Dict, Iterator, Sequence, Tuple
+
+
+class _Row(Mapping):
+    """Base: subclasses set HEADERS and the slot names (_FIELDS) they map to, in order."""
+
+    __slots__ = ()
+    HEADERS: Tuple[str, ...] = ()
+    _FIELDS: Tuple[str, ...] = ()
+    _INDEX: Dict[str, str] = {}
+    _values = staticmethod(lambda row: ())
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._INDEX = dict(zip(cls.HEADERS, cls._FIELDS))
+        cls._values = attrgetter(*cls._FIELDS)
+
+    def __getitem__(self, key: str):
+        try:
+            return getattr(self, self._INDEX[key])
+        except KeyError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key: str, value) -> None:
+        try:
+            setattr(self, self._INDEX[key], value)
+        except KeyError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key) -> bool:
+        return key in self._INDEX
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.HEADERS)
+
+    def __len__(self) -> int:
+        return len(self.HEADERS)
+
+    def values_tuple(self) -> tuple:
+        """Cells in HEADERS order."""
+        return self._values(self)
+
+    def _args(self) -> tuple:
+        """Constructor arguments, in __init__ order."""
+        return self._values(self)
+
+    def copy(self):
+        return type(self)(*self._args())
+
+    def __reduce__(self):
+        return type(self), self._args()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self)!r})"
+
+
+class ParamRow(_Row):
+    __slots__ = ("name", "mandatory", "expected", "in_", "description", "examples")
+    HEADERS = ("Name", "Mandatory", "Expected Value(s)", "In", "Description", "Examples")
+    _FIELDS = __slots__
+
+    def __init__(self, name="", mandatory="", expected="", in_="", description="", examples=""):
+        self.name = name
+        self.mandatory = mandatory
+        self.expected = expected
+        self.in_ = in_
+        self.description = description
+        self.examples = examples
+
+
+class BodyRow(_Row):
+    __slots__ = ("path", "prop", "mandatory", "expected", "description", "examples")
+    HEADERS = ("Path", "Property", "Mandatory", "Expected Value(s)", "Description", "Examples")
+    _FIELDS = __slots__
+
+    def __init__(self, path="", prop="", mandatory="", expected="", description="", examples=""):
+        self.path = path
+        self.prop = prop
+        self.mandatory = mandatory
+        self.expected = expected
+        self.description = description
+        self.examples = examples
+
+    def rebased(self, path: str):
+        """Copy of this row at another Path."""
+        row = self.copy()
+        row.path = path
+        return row
+
+
+class ResponseRow(BodyRow):
+    """BodyRow with a leading Status column; the flattener leaves it empty for the caller to fill."""
+
+    __slots__ = ("status",)
+    HEADERS = ("Status",) + BodyRow.HEADERS
+    _FIELDS = ("status",) + BodyRow.__slots__
+
+    def __init__(self, path="", prop="", mandatory="", expected="", description="", examples="", status=""):
+        super().__init__(path, prop, mandatory, expected, description, examples)
+        self.status = status
+
+    def _args(self) -> tuple:
+        status, *rest = self._values(self)
+        return (*rest, status)
+
+
+def row_values(row, headers: Sequence[str]) -> tuple:
+    """Cells of `row` (a row object or a plain dict) in `headers` order, "" for missing keys.
+    Rows whose own HEADERS equal `headers` (pass a tuple to hit this path) skip the lookups."""
+    if isinstance(row, _Row) and row.HEADERS == headers:
+        return row.values_tuple()
+    return tuple(row.get(h, "") for h in headers)
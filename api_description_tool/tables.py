@@ -1,21 +1,35 @@
 """
 Builds tabular views for Params, Request Body, and Response Body from an OpenAPI 3.x spec.
 This version delegates schema flattening & constraints to flattener.py and avoids deep recursion.
+All builders accept an optional ResolutionContext so one run resolves each $ref once.
+Each build_*_table has an iter_*_rows twin that yields the same rows lazily, so writers can
+consume a table without it ever being held in memory as a whole.
+build_tables() produces all three in one sweep over the operations (what the CLI uses); with
+`[tables] workers` > 1 and enough operations it spreads them over a process pool.
 """
 from __future__ import annotations
 
-from typing import Dict, Iterable, List, Optional
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List, Optional, Tuple
 
 from .flattener import (
-    resolve_ref,
+    DEFAULT_MAX_DEPTH,
+    ResolutionContext,
     extract_constraints as _extract_constraints,
-    flatten_for_table,
+    iter_flattened_rows,
 )
+from .refs import prune_components, reachable_refs, ref_tokens
+from .rows import BodyRow, ParamRow, ResponseRow
 
 
 # Re-export for tests/backward-compat
 extract_constraints = _extract_constraints
 
+# Below this many operations build_tables stays serial even when workers are configured:
+# starting processes and shipping specs costs more than it saves
+DEFAULT_PARALLEL_MIN_OPERATIONS = 200
+
 
 def _iter_operations(spec: dict) -> Iterable[tuple]:
     paths = (spec or {}).get("paths", {})
@@ -28,7 +42,44 @@ def _iter_operations(spec: dict) -> Iterable[tuple]:
             yield url, method.lower(), op
 
 
-def _first_json_schema(content: Optional[dict], components: Optional[dict]) -> Optional[dict]:
+def _max_depth(config: Optional[dict]) -> Optional[int]:
+    """`[tables] max_depth`: an int budget, or none/unlimited for no limit (default 24)."""
+    section = (config or {}).get("tables") or {}
+    raw = str(section.get("max_depth", "")).strip().lower()
+    if not raw:
+        return DEFAULT_MAX_DEPTH
+    if raw in {"none", "unlimited"}:
+        return None
+    try:
+        return int(raw)
+    except ValueError:
+        raise ValueError(f"Unsupported max_depth: {raw} (expected an integer or 'none')")
+
+
+def resolution_context(spec: dict, config: Optional[dict] = None) -> ResolutionContext:
+    """ResolutionContext for `spec` with the [tables] options applied
+    (`constraint_cache`, default True: reuse constraint strings per schema object)."""
+    section = (config or {}).get("tables") or {}
+    raw = str(section.get("constraint_cache", "")).strip().lower()
+    return ResolutionContext.for_spec(spec, cache_constraints=raw not in {"0", "false", "no", "off"})
+
+
+def _parallel_settings(config: Optional[dict]) -> Tuple[int, int]:
+    """`[tables] workers` (default 1 = serial; auto = CPU count) and `parallel_min_operations`."""
+    section = (config or {}).get("tables") or {}
+    raw_workers = str(section.get("workers", "")).strip().lower()
+    raw_min = str(section.get("parallel_min_operations", "")).strip()
+    try:
+        workers = (os.cpu_count() or 1) if raw_workers == "auto" else int(raw_workers or 1)
+        min_operations = int(raw_min) if raw_min else DEFAULT_PARALLEL_MIN_OPERATIONS
+    except ValueError:
+        raise ValueError(
+            f"Unsupported [tables] workers/parallel_min_operations: {raw_workers!r}/{raw_min!r} (expected integers)"
+        )
+    return max(1, workers), max(0, min_operations)
+
+
+def _first_json_schema(content: Optional[dict], ctx: ResolutionContext) -> Optional[dict]:
     if not isinstance(content, dict):
         return None
     # Prefer application/json; otherwise first available
@@ -40,79 +91,211 @@ def _first_json_schema(content: Optional[dict], components: Optional[dict]) -> O
         schema = media.get("schema")
         if not isinstance(schema, dict):
             continue
-        # Resolve top-level $ref to avoid shallow wrappers
-        return resolve_ref(schema, components, ref_stack=[], ref_cache={}) or schema
+        # Left unresolved: the flattener resolves it and tracks recursive roots
+        return schema
     return None
 
 
-def build_request_params_table(spec: dict, config: Optional[dict] = None) -> List[Dict[str, object]]:
-    rows: List[Dict[str, object]] = []
-    components = (spec or {}).get("components", {})
+def _operation_params_rows(op: dict, ctx: ResolutionContext) -> Iterator[ParamRow]:
+    for p in op.get("parameters", []) or []:
+        if not isinstance(p, dict):
+            continue
+        # Resolve parameter $ref (OpenAPI allows $ref for parameters)
+        if "$ref" in p:
+            p = ctx.resolve(p)
+        schema = p.get("schema") or {}
+        if "$ref" in schema:
+            schema = ctx.resolve(schema)
+        yield ParamRow(
+            p.get("name", ""),
+            bool(p.get("required", False)),
+            ctx.constraints(schema),
+            p.get("in", ""),
+            p.get("description", ""),
+            str(p.get("example", "")),
+        )
 
-    for url, method, op in _iter_operations(spec):
-        for p in op.get("parameters", []) or []:
-            if not isinstance(p, dict):
-                continue
-            # Resolve parameter $ref (OpenAPI allows $ref for parameters)
-            if "$ref" in p:
-                p = resolve_ref(p, components, ref_stack=[], ref_cache={}) or p
-            schema = p.get("schema") or {}
-            if "$ref" in schema:
-                schema = resolve_ref(schema, components, ref_stack=[], ref_cache={}) or schema
-            rows.append(
-                {
-                    "Name": p.get("name", ""),
-                    "Mandatory": bool(p.get("required", False)),
-                    "Expected Value(s)": extract_constraints(schema),
-                    "In": p.get("in", ""),
-                    "Description": p.get("description", ""),
-                    "Examples": str(p.get("example", "")),
-                }
-            )
-    return rows
 
+def _operation_request_rows(op: dict, ctx: ResolutionContext, max_depth: Optional[int]) -> Iterator[BodyRow]:
+    rb = op.get("requestBody")
+    if not isinstance(rb, dict):
+        return
+    schema = _first_json_schema(rb.get("content"), ctx)
+    if not isinstance(schema, dict):
+        return
+    yield from iter_flattened_rows(
+        schema,
+        base_path="",
+        emit_array_item_row=False,  # per current tests: don't create rows for primitive array items in request body
+        max_depth=max_depth,
+        ctx=ctx,
+    )
 
-def build_request_body_table(spec: dict, config: Optional[dict] = None) -> List[Dict[str, object]]:
-    rows: List[Dict[str, object]] = []
-    components = (spec or {}).get("components", {})
 
-    for url, method, op in _iter_operations(spec):
-        rb = op.get("requestBody")
-        if not isinstance(rb, dict):
+def _operation_response_rows(op: dict, ctx: ResolutionContext, max_depth: Optional[int]) -> Iterator[ResponseRow]:
+    responses = op.get("responses", {}) or {}
+    for status, r in responses.items():
+        if not isinstance(r, dict):
             continue
-        schema = _first_json_schema(rb.get("content"), components)
+        schema = _first_json_schema(r.get("content"), ctx)
         if not isinstance(schema, dict):
             continue
-        flattened = flatten_for_table(
-            schema,
-            components=components,
-            base_path="",
-            emit_array_item_row=False,  # per current tests: don't create rows for primitive array items in request body
-        )
-        rows.extend(flattened)
-    return rows
+        status = str(status)
+        for row in iter_flattened_rows(
+                schema,
+                base_path="",
+                emit_array_item_row=True,  # allow explicit item row for primitive arrays (kinds[0] etc.)
+                max_depth=max_depth,
+                ctx=ctx,
+                row_type=ResponseRow,
+        ):
+            # flattened rows are fresh objects, so Status can be set in place
+            row.status = status
+            yield row
+
 
+def iter_request_params_rows(
+        spec: dict, config: Optional[dict] = None, ctx: Optional[ResolutionContext] = None
+) -> Iterator[ParamRow]:
+    ctx = ctx or resolution_context(spec, config)
+    for url, method, op in _iter_operations(spec):
+        yield from _operation_params_rows(op, ctx)
 
-def build_response_body_table(spec: dict, config: Optional[dict] = None) -> List[Dict[str, object]]:
-    rows: List[Dict[str, object]] = []
-    components = (spec or {}).get("components", {})
 
+def iter_request_body_rows(
+        spec: dict, config: Optional[dict] = None, ctx: Optional[ResolutionContext] = None
+) -> Iterator[BodyRow]:
+    ctx = ctx or resolution_context(spec, config)
+    max_depth = _max_depth(config)
     for url, method, op in _iter_operations(spec):
-        responses = op.get("responses", {}) or {}
-        for status, r in responses.items():
-            if not isinstance(r, dict):
-                continue
-            schema = _first_json_schema(r.get("content"), components)
-            if not isinstance(schema, dict):
-                continue
-            flattened = flatten_for_table(
-                schema,
-                components=components,
-                base_path="",
-                emit_array_item_row=True,  # allow explicit item row for primitive arrays (kinds[0] etc.)
+        yield from _operation_request_rows(op, ctx, max_depth)
+
+
+def iter_response_body_rows(
+        spec: dict, config: Optional[dict] = None, ctx: Optional[ResolutionContext] = None
+) -> Iterator[ResponseRow]:
+    ctx = ctx or resolution_context(spec, config)
+    max_depth = _max_depth(config)
+    for url, method, op in _iter_operations(spec):
+        yield from _operation_response_rows(op, ctx, max_depth)
+
+
+def build_request_params_table(
+        spec: dict, config: Optional[dict] = None, ctx: Optional[ResolutionContext] = None
+) -> List[ParamRow]:
+    return list(iter_request_params_rows(spec, config, ctx))
+
+
+def build_request_body_table(
+        spec: dict, config: Optional[dict] = None, ctx: Optional[ResolutionContext] = None
+) -> List[BodyRow]:
+    return list(iter_request_body_rows(spec, config, ctx))
+
+
+def build_response_body_table(
+        spec: dict, config: Optional[dict] = None, ctx: Optional[ResolutionContext] = None
+) -> List[ResponseRow]:
+    return list(iter_response_body_rows(spec, config, ctx))
+
+
+def build_tables(
+        spec: dict, config: Optional[dict] = None, ctx: Optional[ResolutionContext] = None
+) -> Tuple[List[ParamRow], List[BodyRow], List[ResponseRow]]:
+    """All three tables from a single sweep over the operations.
+    Same rows as the three build_*_table calls; each operation is visited once and the
+    config is parsed once for all of them."""
+    ctx = ctx or resolution_context(spec, config)
+    operations = list(_iter_operations(spec))
+    workers, min_operations = _parallel_settings(config)
+    if workers > 1 and len(operations) >= max(2, min_operations):
+        return _build_tables_parallel(spec, config, ctx, operations, workers)
+    return _build_operations(operations, config, ctx)
+
+
+def _build_operations(
+        operations: List[tuple], config: Optional[dict], ctx: ResolutionContext
+) -> Tuple[List[ParamRow], List[BodyRow], List[ResponseRow]]:
+    max_depth = _max_depth(config)
+    params: List[ParamRow] = []
+    req_body: List[BodyRow] = []
+    res_body: List[ResponseRow] = []
+    for url, method, op in operations:
+        params.extend(_operation_params_rows(op, ctx))
+        req_body.extend(_operation_request_rows(op, ctx, max_depth))
+        res_body.extend(_operation_response_rows(op, ctx, max_depth))
+    return params, req_body, res_body
+
+
+def _operations_document(spec: dict, operations: List[tuple]) -> dict:
+    """Minimal document for a batch of operations: just those operations under `paths`, plus
+    the components (and any path items) their $refs reach, so workers get only what they use."""
+    paths: dict = {}
+    for url, method, op in operations:
+        paths.setdefault(url, {})[method] = op
+    doc = dict(spec)
+    doc["paths"] = paths
+    refs = reachable_refs(spec, [op for _, _, op in operations])
+    all_paths = spec.get("paths") or {}
+    for ref in refs:
+        # refs into other path items (rare) travel with the whole item; the worker only
+        # builds the operations it was given, so extra items add no rows
+        tokens = ref_tokens(ref)
+        if tokens and len(tokens) >= 2 and tokens[0] == "paths":
+            url = tokens[1]
+            if url in all_paths:
+                paths[url] = {**all_paths[url], **paths.get(url, {})}
+    return prune_components(doc, refs)
+
+
+def _build_batch(doc: dict, keys: List[tuple], config: dict) -> tuple:
+    """Worker: build the rows of `keys` ((url, method) pairs) from their minimal document."""
+    ctx = resolution_context(doc, config)
+    operations = [(url, method, doc["paths"][url][method]) for url, method in keys]
+    tables = _build_operations(operations, config, ctx)
+    return tables, ctx.stats(), ctx.depth_truncations
+
+
+def _build_tables_parallel(
+        spec: dict, config: Optional[dict], ctx: ResolutionContext, operations: List[tuple], workers: int
+) -> Tuple[List[ParamRow], List[BodyRow], List[ResponseRow]]:
+    """Contiguous batches of operations over a process pool, merged back in document order,
+    so the rows are exactly those of the serial sweep. Worker cache counters and depth
+    truncations are folded into `ctx` for reporting."""
+    # a few batches per worker evens out operations of very different sizes
+    n_batches = min(len(operations), workers * 4)
+    size, extra = divmod(len(operations), n_batches)
+    batches, start = [], 0
+    for i in range(n_batches):
+        end = start + size + (1 if i < extra else 0)
+        batches.append(operations[start:end])
+        start = end
+
+    worker_config = {"tables": dict((config or {}).get("tables") or {})}
+    params: List[ParamRow] = []
+    req_body: List[BodyRow] = []
+    res_body: List[ResponseRow] = []
+    with ProcessPoolExecutor(max_workers=min(workers, n_batches)) as pool:
+        futures = [
+            pool.submit(
+                _build_batch,
+                _operations_document(spec, batch),
+                [(url, method) for url, method, _ in batch],
+                worker_config,
             )
-            for row in flattened:
-                new_row = dict(row)
-                new_row["Status"] = str(status)
-                rows.append(new_row)
-    return rows
\ No newline at end of file
+            for batch in batches
+        ]
+        for future in futures:
+            (p, rq, rs), stats, truncations = future.result()
+            params.extend(p)
+            req_body.extend(rq)
+            res_body.extend(rs)
+            ctx.hits += stats["hits"]
+            ctx.misses += stats["misses"]
+            ctx.memo_hits += stats["flatten_memo_hits"]
+            ctx.memo_misses += stats["flatten_memo_misses"]
+            ctx.constraint_hits += stats["constraint_hits"]
+            ctx.constraint_misses += stats["constraint_misses"]
+            ctx.merge_hits += stats["merge_hits"]
+            ctx.merge_misses += stats["merge_misses"]
+            ctx.depth_truncations.extend(truncations)
+    return params, req_body, res_body
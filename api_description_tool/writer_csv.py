@@ -1,16 +1,93 @@
 # api_description_tool/writer_csv.py
 import csv
+import gzip
+import io
+from itertools import chain, islice
 
-def write_csv(base_filename: str, params: list, req_body: list, res_body: list):
-    def write_section(filename, rows):
-        if not rows:
-            return
-        headers = list(rows[0].keys())
-        with open(filename, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=headers)
-            writer.writeheader()
-            writer.writerows(rows)
-
-    write_section(f"{base_filename}_params.csv", params)
-    write_section(f"{base_filename}_req_body.csv", req_body)
-    write_section(f"{base_filename}_res_body.csv", res_body)
+from .rows import BodyRow, ParamRow, ResponseRow, row_values
+
+CSV_COMPRESSIONS = ("none", "gzip")
+# Table choices for write_csv_stream; "all" adds a leading Table column naming each row's table
+STREAM_TABLES = ("all", "params", "req_body", "res_body")
+# Rows are formatted into an in-memory chunk of this many rows, then written in one call
+CHUNK_ROWS = 5000
+
+
+def _open_text(path: str, compression: str):
+    if compression == "gzip":
+        # mtime=0 keeps the bytes reproducible for identical tables
+        raw = gzip.GzipFile(path, mode="wb", compresslevel=6, mtime=0)
+        return io.TextIOWrapper(raw, encoding="utf-8", newline="")
+    return open(path, "w", newline="", encoding="utf-8")
+
+
+def _write_chunked(f, headers: tuple, values) -> None:
+    """Header line, then `values` (tuples of cells) formatted CHUNK_ROWS at a time into `f`."""
+    chunk = io.StringIO()
+    writer = csv.writer(chunk)
+    writer.writerow(headers)
+    while True:
+        batch = list(islice(values, CHUNK_ROWS))
+        writer.writerows(batch)
+        f.write(chunk.getvalue())
+        chunk.seek(0)
+        chunk.truncate()
+        if len(batch) < CHUNK_ROWS:
+            break
+
+
+def write_table_csv(path: str, headers, rows, compression: str = "none") -> None:
+    """Stream `rows` (any iterable of rows.* objects or plain dicts) into one CSV file with
+    fixed `headers`. Only one chunk of rows is held at a time; an empty table still gets
+    its header line."""
+    if compression not in CSV_COMPRESSIONS:
+        raise ValueError(f"Unsupported CSV compression: {compression} (expected {'|'.join(CSV_COMPRESSIONS)})")
+    headers = tuple(headers)
+    with _open_text(path, compression) as f:
+        _write_chunked(f, headers, (row_values(row, headers) for row in rows))
+
+
+def write_csv(base_filename: str, params, req_body, res_body, compression: str = "none") -> list:
+    """Write <base>_params.csv, <base>_req_body.csv and <base>_res_body.csv (".csv.gz" with
+    gzip compression); each table may be a list or any iterable of rows.
+    Returns the paths written."""
+    suffix = ".csv.gz" if compression == "gzip" else ".csv"
+    written = []
+    for name, headers, rows in (
+            ("params", ParamRow.HEADERS, params),
+            ("req_body", BodyRow.HEADERS, req_body),
+            ("res_body", ResponseRow.HEADERS, res_body),
+    ):
+        path = f"{base_filename}_{name}{suffix}"
+        write_table_csv(path, headers, rows, compression)
+        written.append(path)
+    return written
+
+
+# Union of the three tables' columns for the "all" stream, in sheet order where they overlap
+ALL_TABLES_HEADERS = (
+    "Table", "Status", "Path", "Property", "Name", "Mandatory", "Expected Value(s)", "In", "Description", "Examples"
+)
+
+
+def write_csv_stream(stream, params, req_body, res_body, table: str = "all") -> None:
+    """Write one table ("params", "req_body" or "res_body") as CSV to the text `stream`
+    (e.g. sys.stdout), or with table="all" every row of the three under ALL_TABLES_HEADERS,
+    its Table cell naming the table it came from. Nothing touches the filesystem."""
+    if table not in STREAM_TABLES:
+        raise ValueError(f"Unsupported table: {table} (expected {'|'.join(STREAM_TABLES)})")
+    tables = (
+        ("params", ParamRow.HEADERS, params),
+        ("req_body", BodyRow.HEADERS, req_body),
+        ("res_body", ResponseRow.HEADERS, res_body),
+    )
+    if table == "all":
+        cells = ALL_TABLES_HEADERS[1:]
+        values = chain.from_iterable(
+            ((name,) + row_values(row, cells) for row in rows) for name, _, rows in tables
+        )
+        _write_chunked(stream, ALL_TABLES_HEADERS, values)
+    else:
+        _, headers, rows = next(t for t in tables if t[0] == table)
+        _write_chunked(stream, headers, (row_values(row, headers) for row in rows))
+    stream.flush()
@@ -1,14 +1,69 @@
+"""
+Excel writer with pluggable engines.
+Sheet layout (names, headers, mandatory-bold rules, column widths) lives here; an engine
+only knows how to add a sheet, append a row with some cells bold, size columns and close.
+
+Engines
+-------
+- openpyxl   — always available; write-only mode, so widths must be fixed before the first
+               row (streamed tables are sized from the first WIDTH_LOOKAHEAD_ROWS rows)
+- xlsxwriter — optional (`pip install xlsxwriter`); constant-memory mode, faster, and sizes
+               columns from every row in the same pass
+openpyxl is the default; xlsxwriter is opt-in with `[output] excel_engine=xlsxwriter`
+(or `auto`, which picks xlsxwriter when it is installed, else openpyxl).
+"""
 from __future__ import annotations
 
-from typing import Dict, List
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+import pickle
+import tempfile
+from itertools import chain, islice
+from typing import Dict, Iterable, List, Optional
 
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font
+from openpyxl.utils import get_column_letter
+
+from .rows import BodyRow, ParamRow, ResponseRow, row_values
+
+try:
+    import xlsxwriter
+except ImportError:  # optional dependency
+    xlsxwriter = None
+
+
+PARAMS_HEADERS = list(ParamRow.HEADERS)
+REQ_HEADERS = list(BodyRow.HEADERS)
+RES_HEADERS = list(ResponseRow.HEADERS)
+
+EXCEL_ENGINES = ("auto", "openpyxl", "xlsxwriter")
+XLSXWRITER_AVAILABLE = xlsxwriter is not None
+
+# Write-only sheets need column widths before the first row, so streamed (non-list) tables
+# size their columns from this many leading rows
+WIDTH_LOOKAHEAD_ROWS = 1000
+MAX_COLUMN_WIDTH = 60
 
+# Excel's worksheet limit is 1,048,576 rows, one of which holds the headers
+EXCEL_MAX_DATA_ROWS = 1_048_575
 
-PARAMS_HEADERS = ["Name", "Mandatory", "Expected Value(s)", "In", "Description", "Examples"]
-REQ_HEADERS = ["Path", "Property", "Mandatory", "Expected Value(s)", "Description", "Examples"]
-RES_HEADERS = ["Status", "Path", "Property", "Mandatory", "Expected Value(s)", "Description", "Examples"]
+# One shared style object for every bold cell
+BOLD = Font(bold=True)
+
+
+def resolve_excel_engine(engine: str = "openpyxl") -> str:
+    """Map the [output] excel_engine setting (default openpyxl) to a concrete engine name
+    ("openpyxl" or "xlsxwriter")."""
+    name = (engine or "openpyxl").strip().lower()
+    if name not in EXCEL_ENGINES:
+        raise ValueError(f"Unsupported excel_engine: {name} (expected {'|'.join(EXCEL_ENGINES)})")
+    if name == "auto":
+        return "xlsxwriter" if XLSXWRITER_AVAILABLE else "openpyxl"
+    if name == "xlsxwriter" and not XLSXWRITER_AVAILABLE:
+        raise ValueError("Excel engine 'xlsxwriter' requested but it is not installed (pip install xlsxwriter)")
+    return name
 
 
 def _truthy(v) -> bool:
@@ -19,52 +74,250 @@ def _truthy(v) -> bool:
     return str(v).strip().lower() in {"1", "true", "yes", "on"}
 
 
-def _write_sheet(ws, headers: List[str], rows: List[Dict[str, object]], *, bold_fields: List[str]):
-    # headers
-    ws.append(headers)
-    # rows
-    for row in rows:
-        ws.append([row.get(h, "") for h in headers])
-
-    # Identify columns
-    col_index = {h: i + 1 for i, h in enumerate(headers)}  # 1-based
-    mandatory_idx = col_index.get("Mandatory")
-
-    # Bold requested fields when Mandatory == True
-    if mandatory_idx:
-        for r in range(2, ws.max_row + 1):  # skip header
-            is_mand = _truthy(ws.cell(row=r, column=mandatory_idx).value)
-            if is_mand:
-                for field in bold_fields:
-                    cidx = col_index.get(field)
-                    if cidx:
-                        cell = ws.cell(row=r, column=cidx)
-                        cell.font = Font(bold=True)
-
-    # Auto width (simple)
-    for col_idx, header in enumerate(headers, start=1):
-        max_len = len(str(header))
-        for r in range(2, ws.max_row + 1):
-            v = ws.cell(row=r, column=col_idx).value
+class ExcelBackend(ABC):
+    """One workbook being written sheet by sheet.
+    `widths_up_front` engines need set_widths() before the sheet's first append();
+    the others accept it once the sheet's rows are in."""
+
+    widths_up_front = True
+    # whether rename_sheet() is available; other engines must know a sheet's final name up front
+    renames_sheets = False
+
+    @abstractmethod
+    def add_sheet(self, title: str) -> None:
+        """Start a new current sheet."""
+
+    def rename_sheet(self, title: str) -> None:
+        """Retitle the current sheet (only called when `renames_sheets`)."""
+        raise NotImplementedError(f"{type(self).__name__} cannot rename sheets")
+
+    @abstractmethod
+    def set_widths(self, widths: List[float]) -> None:
+        """Column widths of the current sheet, first column first."""
+
+    @abstractmethod
+    def append(self, values: Sequence, bold: Sequence[int] = ()) -> None:
+        """Append a row to the current sheet, bolding the cells at the `bold` column indexes."""
+
+    @abstractmethod
+    def close(self) -> None:
+        """Write the workbook out."""
+
+
+class OpenpyxlBackend(ExcelBackend):
+    widths_up_front = True
+    renames_sheets = True
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.wb = Workbook(write_only=True)
+        self.ws = None
+
+    def add_sheet(self, title: str) -> None:
+        self.ws = self.wb.create_sheet(title)
+
+    def rename_sheet(self, title: str) -> None:
+        # write-only sheets take their name from the workbook at save time
+        self.ws.title = title
+
+    def set_widths(self, widths: List[float]) -> None:
+        for col_idx, width in enumerate(widths, start=1):
+            self.ws.column_dimensions[get_column_letter(col_idx)].width = width
+
+    def append(self, values: Sequence, bold: Sequence[int] = ()) -> None:
+        if bold:
+            values = list(values)
+            for i in bold:
+                cell = WriteOnlyCell(self.ws, value=values[i])
+                cell.font = BOLD
+                values[i] = cell
+        self.ws.append(values)
+
+    def close(self) -> None:
+        self.wb.save(self.file_path)
+
+
+class XlsxWriterBackend(ExcelBackend):
+    widths_up_front = False
+
+    def __init__(self, file_path: str):
+        # Cells are literal text: no formula/URL/number guessing on strings
+        self.wb = xlsxwriter.Workbook(
+            file_path,
+            {"constant_memory": True, "strings_to_formulas": False, "strings_to_urls": False, "strings_to_numbers": False},
+        )
+        self.bold = self.wb.add_format({"bold": True})
+        self.plain = self.wb.add_format()
+        self.ws = None
+        self.row = 0
+
+    def add_sheet(self, title: str) -> None:
+        self.ws = self.wb.add_worksheet(title)
+        self.row = 0
+
+    def set_widths(self, widths: List[float]) -> None:
+        for col_idx, width in enumerate(widths):
+            self.ws.set_column(col_idx, col_idx, width)
+
+    def append(self, values: Sequence, bold: Sequence[int] = ()) -> None:
+        ws, row = self.ws, self.row
+        written = False
+        for col_idx, v in enumerate(values):
+            if v is None or v == "":
+                continue
+            # table cells are nearly all str/bool: skip write()'s type dispatch for those
+            write = ws.write_string if type(v) is str else ws.write_boolean if type(v) is bool else ws.write
+            if col_idx in bold:
+                write(row, col_idx, v, self.bold)
+            else:
+                write(row, col_idx, v)
+            written = True
+        if not written:
+            # xlsxwriter drops unformatted blanks; keep all-empty rows (e.g. placeholder rows) in the sheet
+            ws.write_blank(row, 0, None, self.plain)
+        self.row = row + 1
+
+    def close(self) -> None:
+        self.wb.close()
+
+
+BACKENDS = {"openpyxl": OpenpyxlBackend, "xlsxwriter": XlsxWriterBackend}
+
+
+class _WidthTracker:
+    def __init__(self, headers: List[str]):
+        self.widths = [len(str(h)) for h in headers]
+
+    def update(self, values: Sequence) -> None:
+        widths = self.widths
+        for i, v in enumerate(values):
             if v is not None:
-                max_len = max(max_len, len(str(v)))
-        ws.column_dimensions[ws.cell(row=1, column=col_idx).column_letter].width = min(max_len + 2, 60)
+                n = len(str(v))
+                if n > widths[i]:
+                    widths[i] = n
+
+    def result(self) -> List[int]:
+        return [min(w + 2, MAX_COLUMN_WIDTH) for w in self.widths]
+
+
+def _write_sheet(
+        backend: ExcelBackend,
+        title: str,
+        headers: List[str],
+        rows: Iterable[Dict[str, object]],
+        *,
+        bold_fields: List[str],
+        max_rows: int = EXCEL_MAX_DATA_ROWS,
+):
+    """Stream `rows` into a sheet named `title`: values, bold and widths are handled as each
+    row is appended, so nothing is read back and memory does not grow with the row count.
+
+    A table longer than `max_rows` is written over sheets "<title> (1)", "<title> (2)", ...
+    Every row is written and each shard sizes its own columns. For a sequence the names
+    follow from len(); otherwise the first sheet is retitled "<title> (1)" when row
+    `max_rows + 1` arrives, or, on engines that cannot rename sheets, the first shard is
+    spooled to a temporary file to count it before its sheet is added."""
+    if max_rows < 1:
+        raise ValueError(f"max_rows_per_sheet must be at least 1, got {max_rows}")
+    cells = tuple(headers)
+    mandatory_idx = headers.index("Mandatory") if "Mandatory" in headers else None
+    bold_idx = [i for i, h in enumerate(headers) if h in bold_fields]
+    track = not backend.widths_up_front
+    materialized = isinstance(rows, Sequence)
+
+    values_iter = (row_values(row, cells) for row in rows)
+    if materialized:
+        sharded = len(rows) > max_rows
+    elif backend.renames_sheets:
+        sharded = None  # decided once the first shard is written
+    else:
+        sharded, values_iter = _spool_ahead(values_iter, max_rows)
+    shard = 0
+    while True:
+        shard_values = islice(values_iter, max_rows)
+        tracker = _WidthTracker(headers)
+        backend.add_sheet(_shard_title(title, shard + 1) if sharded else title)
+
+        if backend.widths_up_front:
+            if materialized:
+                # already in memory: size columns from every row of this shard
+                for k in range(shard * max_rows, min(len(rows), (shard + 1) * max_rows)):
+                    tracker.update(row_values(rows[k], cells))
+            else:
+                head = list(islice(shard_values, WIDTH_LOOKAHEAD_ROWS))
+                for values in head:
+                    tracker.update(values)
+                shard_values = chain(head, shard_values)
+            backend.set_widths(tracker.result())
+
+        backend.append(headers)
+
+        # Bold requested fields when Mandatory == True
+        for values in shard_values:
+            if track:
+                tracker.update(values)
+            if mandatory_idx is not None and _truthy(values[mandatory_idx]):
+                backend.append(values, bold_idx)
+            else:
+                backend.append(values)
+
+        if track:
+            backend.set_widths(tracker.result())
+
+        following = next(values_iter, None)
+        if following is None:
+            return
+        if sharded is None:
+            backend.rename_sheet(_shard_title(title, 1))
+            sharded = True
+        values_iter = chain((following,), values_iter)
+        shard += 1
+
+
+def _shard_title(title: str, n: int) -> str:
+    return f"{title} ({n})"
+
+
+def _spool_ahead(values_iter, limit: int):
+    """Copy up to `limit` rows of `values_iter` into an anonymous temporary file and peek at the
+    next one, keeping memory flat. Returns (more than `limit` rows?, iterator over all rows)."""
+    spool = tempfile.TemporaryFile()
+    count = 0
+    for values in islice(values_iter, limit):
+        pickle.dump(values, spool, pickle.HIGHEST_PROTOCOL)
+        count += 1
+    following = next(values_iter, None)
+
+    def replay():
+        with spool:
+            spool.seek(0)
+            for _ in range(count):
+                yield pickle.load(spool)
+
+    rest = chain((following,), values_iter) if following is not None else ()
+    return following is not None, chain(replay(), rest)
 
 
-def write_excel(file_path: str, params_rows: List[Dict[str, object]], req_rows: List[Dict[str, object]], res_rows: List[Dict[str, object]]):
-    wb = Workbook()
+def write_excel(
+        file_path: str,
+        params_rows: Iterable[Dict[str, object]],
+        req_rows: Iterable[Dict[str, object]],
+        res_rows: Iterable[Dict[str, object]],
+        engine: Optional[str] = "openpyxl",
+        max_rows_per_sheet: Optional[int] = None,
+):
+    """Write the three tables; any table longer than `max_rows_per_sheet` data rows
+    (default and upper bound: what one Excel worksheet holds) is split over numbered sheets."""
+    backend = BACKENDS[resolve_excel_engine(engine)](file_path)
+    max_rows = min(max_rows_per_sheet or EXCEL_MAX_DATA_ROWS, EXCEL_MAX_DATA_ROWS)
 
     # Params: bold Name for mandatory (no Path column here)
-    ws_params = wb.active
-    ws_params.title = "Params"
-    _write_sheet(ws_params, PARAMS_HEADERS, params_rows, bold_fields=["Name"])
+    _write_sheet(backend, "Params", PARAMS_HEADERS, params_rows, bold_fields=["Name"], max_rows=max_rows)
 
     # Req Body: bold both Path and Property on mandatory rows
-    ws_req = wb.create_sheet("Req Body")
-    _write_sheet(ws_req, REQ_HEADERS, req_rows, bold_fields=["Path", "Property"])
+    _write_sheet(backend, "Req Body", REQ_HEADERS, req_rows, bold_fields=["Path", "Property"], max_rows=max_rows)
 
     # Res Body: bold both Path and Property on mandatory rows
-    ws_res = wb.create_sheet("Res Body")
-    _write_sheet(ws_res, RES_HEADERS, res_rows, bold_fields=["Path", "Property"])
+    _write_sheet(backend, "Res Body", RES_HEADERS, res_rows, bold_fields=["Path", "Property"], max_rows=max_rows)
 
-    wb.save(file_path)
\ No newline at end of file
+    backend.close()
@@ -0,0 +1,91 @@
+"""
+Micro-benchmark: constraint-string cache on an enum-heavy synthetic spec.
+
+    python -m benchmarks.bench_constraints [--enum-size N] [--operations N]   (from the repo root)
+
+Builds the three tables with `[tables] constraint_cache` on and off and prints the best
+wall time of several runs for each.
+"""
+from __future__ import annotations
+
+import argparse
+import timeit
+
+from api_description_tool.tables import (
+    build_request_body_table,
+    build_request_params_table,
+    build_response_body_table,
+    resolution_context,
+)
+
+
+def enum_heavy_spec(enum_size: int, operations: int) -> dict:
+    codes = {"type": "string", "enum": [f"CODE_{i:05d}" for i in range(enum_size)]}
+    schemas = {
+        "Country": codes,
+        "Currency": {"type": "string", "enum": [f"C{i:03d}" for i in range(enum_size // 4)]},
+        "Address": {
+            "type": "object",
+            "properties": {
+                "country": {"$ref": "#/components/schemas/Country"},
+                "line": {"type": "string", "maxLength": 80},
+            },
+        },
+        "Offer": {
+            "type": "object",
+            "properties": {
+                "origin": {"$ref": "#/components/schemas/Country"},
+                "destination": {"$ref": "#/components/schemas/Country"},
+                "currency": {"$ref": "#/components/schemas/Currency"},
+                "tags": {"type": "array", "items": {"$ref": "#/components/schemas/Country"}},
+                "address": {"$ref": "#/components/schemas/Address"},
+            },
+        },
+    }
+    paths = {}
+    for i in range(operations):
+        paths[f"/offers/{i}"] = {
+            "get": {
+                "parameters": [{"name": "country", "in": "query", "schema": {"$ref": "#/components/schemas/Country"}}],
+                "responses": {
+                    "200": {
+                        "description": "ok",
+                        "content": {"application/json": {"schema": {
+                            "type": "object",
+                            "properties": {
+                                "offers": {"type": "array", "items": {"$ref": "#/components/schemas/Offer"}},
+                                "home": {"$ref": "#/components/schemas/Country"},
+                            },
+                        }}},
+                    }
+                },
+            }
+        }
+    return {"openapi": "3.0.3", "paths": paths, "components": {"schemas": schemas}}
+
+
+def _build(spec: dict, config: dict) -> int:
+    ctx = resolution_context(spec, config)
+    return sum(
+        len(build(spec, config, ctx))
+        for build in (build_request_params_table, build_request_body_table, build_response_body_table)
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--enum-size", type=int, default=2000)
+    parser.add_argument("--operations", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    spec = enum_heavy_spec(args.enum_size, args.operations)
+    for label, value in (("cache on", "True"), ("cache off", "False")):
+        config = {"tables": {"constraint_cache": value}}
+        rows = _build(spec, config)
+        best = min(timeit.repeat(lambda: _build(spec, config), number=1, repeat=args.repeat))
+        print(f"{label:9}: {best * 1000:8.1f} ms ({rows} rows)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Benchmark: Excel engines on generated tables.
+
+    python -m benchmarks.bench_excel [--rows N]   (from the repo root)
+
+Writes a workbook with N response rows (plus small params / request tables) with each
+available engine and prints the wall time and output size.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+
+from api_description_tool.rows import BodyRow, ParamRow, ResponseRow
+from api_description_tool.writer_excel import XLSXWRITER_AVAILABLE, write_excel
+
+
+def generated_tables(rows: int):
+    params = [ParamRow(f"p{i}", i % 2 == 0, "string", "query", "a parameter", "") for i in range(100)]
+    req = [BodyRow(f"/items[0]/n{i % 40}", f"f{i}", i % 3 == 0, "integer min=0", "field", "") for i in range(1000)]
+    res = (
+        ResponseRow(f"/data/offers[0]/leg{i % 25}", f"prop{i}", i % 3 == 0, "string enum=A,B,C", "description", "x", "200")
+        for i in range(rows)
+    )
+    return params, req, res
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    engines = ["openpyxl"] + (["xlsxwriter"] if XLSXWRITER_AVAILABLE else [])
+    with tempfile.TemporaryDirectory() as tmp:
+        for engine in engines:
+            path = os.path.join(tmp, f"{engine}.xlsx")
+            started = time.perf_counter()
+            write_excel(path, *generated_tables(args.rows), engine=engine)
+            elapsed = time.perf_counter() - started
+            print(f"{engine:10}: {elapsed:6.2f} s, {os.path.getsize(path) / 1e6:5.1f} MB ({args.rows} rows)")
+    if not XLSXWRITER_AVAILABLE:
+        print("xlsxwriter not installed; pip install xlsxwriter to compare")
+
+
+if __name__ == "__main__":
+    main()
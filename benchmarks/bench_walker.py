@@ -0,0 +1,93 @@
+"""
+Benchmark: explicit-stack schema walker against the recursive walker it replaced.
+
+    python -m benchmarks.bench_walker [--repeat N] [--revs REV ...]   (from the repo root, in a git checkout)
+
+Loads api_description_tool/flattener.py as of each git revision (default: the last recursive
+walker and the first explicit-stack one), plus the working tree, flattens every request /
+response body schema of the tests/data specs with a fresh ResolutionContext per run, checks
+that all versions produce the same rows and prints the best wall time of each.
+The working-tree walker also carries the later constraint and composite-merge caches, so
+only the two pinned revisions isolate the walker change itself.
+"""
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import subprocess
+import sys
+import timeit
+from pathlib import Path
+
+import yaml
+
+import api_description_tool
+from api_description_tool import flattener
+
+ROOT = Path(__file__).resolve().parent.parent
+DATA = ROOT / "tests" / "data"
+# last recursive walker, first explicit-stack walker
+DEFAULT_REVS = ("9195a74", "a0a72a8")
+
+
+def flattener_at(rev: str):
+    """flattener.py as of `rev`, imported inside the package so its relative imports resolve."""
+    source = subprocess.run(
+        ["git", "show", f"{rev}:api_description_tool/flattener.py"],
+        cwd=ROOT, check=True, capture_output=True, text=True,
+    ).stdout
+    name = f"api_description_tool._flattener_{rev}"
+    module = importlib.util.module_from_spec(importlib.util.spec_from_loader(name, loader=None))
+    module.__package__ = api_description_tool.__name__
+    sys.modules[name] = module
+    exec(compile(source, f"{rev}:flattener.py", "exec"), module.__dict__)
+    return module
+
+
+def body_schemas(spec: dict) -> list:
+    out = []
+    for item in (spec.get("paths") or {}).values():
+        for op in (item or {}).values():
+            if not isinstance(op, dict):
+                continue
+            bodies = [op.get("requestBody") or {}] + list((op.get("responses") or {}).values())
+            for body in bodies:
+                for media in ((body or {}).get("content") or {}).values():
+                    if isinstance((media or {}).get("schema"), dict):
+                        out.append(media["schema"])
+    return out
+
+
+def _flatten_all(module, cases) -> list:
+    rows = []
+    for spec, schemas in cases:
+        ctx = module.ResolutionContext.for_spec(spec)
+        for schema in schemas:
+            rows.extend(dict(row) for row in module.flatten_for_table(schema, ctx=ctx))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--revs", nargs="+", default=list(DEFAULT_REVS), help="git revisions to compare")
+    args = parser.parse_args()
+
+    cases = []
+    for path in sorted(DATA.glob("*.y*ml")):
+        spec = yaml.safe_load(path.read_text(encoding="utf-8"))
+        cases.append((spec, body_schemas(spec)))
+
+    walkers = [(rev, flattener_at(rev)) for rev in args.revs] + [("worktree", flattener)]
+    expected = _flatten_all(walkers[0][1], cases)
+    for label, module in walkers:
+        rows = _flatten_all(module, cases)
+        if rows != expected:
+            print(f"{label:9}: rows differ from {walkers[0][0]}")
+            continue
+        best = min(timeit.repeat(lambda: _flatten_all(module, cases), number=1, repeat=args.repeat))
+        print(f"{label:9}: {best * 1000:8.1f} ms ({len(rows)} rows)")
+
+
+if __name__ == "__main__":
+    main()
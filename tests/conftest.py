@@ -7,6 +7,14 @@ from pathlib import Path
 import pytest
 import yaml
 
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    """Keep the on-disk cache out of the user's home during tests."""
+    cache_dir = tmp_path / ".cache"
+    monkeypatch.setenv("API_DESC_TOOL_CACHE_DIR", str(cache_dir))
+    return cache_dir
+
+
 @pytest.fixture
 def valid_openapi_spec_dict():
     """A minimal valid OpenAPI 3.0.1 dict that exercises params, req body, $ref, arrays, and 2xx/default responses."""
@@ -0,0 +1,78 @@
+import os
+import time
+
+from api_description_tool import __version__
+from api_description_tool.cache import DiskCache, default_cache_dir, file_digest, get_or_load
+from api_description_tool.parser import load_yaml
+
+
+def test_default_cache_dir_honours_env(tmp_path, monkeypatch):
+    monkeypatch.setenv("API_DESC_TOOL_CACHE_DIR", str(tmp_path / "c"))
+    assert default_cache_dir() == tmp_path / "c"
+
+
+def test_disk_cache_roundtrip_and_version_in_key(tmp_path):
+    cache = DiskCache(tmp_path, "specs")
+    assert cache.get("k") is None
+    cache.put("k", {"a": [1, 2]})
+    assert cache.get("k") == {"a": [1, 2]}
+    assert cache.hits == 1 and cache.misses == 1
+    files = list((tmp_path / "specs").glob("*.pkl"))
+    assert [f.name for f in files] == [f"{__version__}-k.pkl"]
+
+
+def test_disk_cache_corrupt_entry_is_a_miss(tmp_path):
+    cache = DiskCache(tmp_path, "specs")
+    cache.put("k", 1)
+    (tmp_path / "specs" / f"{__version__}-k.pkl").write_bytes(b"not a pickle")
+    assert cache.get("k", "default") == "default"
+    assert not (tmp_path / "specs" / f"{__version__}-k.pkl").exists()
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path):
+    cache = DiskCache(tmp_path, "specs", max_bytes=10_000)
+    blob = b"x" * 4000
+    for key in ("a", "b"):
+        cache.put(key, blob)
+    # make "a" older than "b", then touch "a" via a hit so "b" becomes the LRU entry
+    old = time.time() - 100
+    os.utime(tmp_path / "specs" / f"{__version__}-a.pkl", (old, old))
+    os.utime(tmp_path / "specs" / f"{__version__}-b.pkl", (old + 1, old + 1))
+    assert cache.get("a") == blob
+    cache.put("c", blob)
+    assert cache.get("b") is None
+    assert cache.get("a") == blob
+    assert cache.get("c") == blob
+
+
+def test_get_or_load_without_cache_calls_loader():
+    assert get_or_load(None, "k", lambda: 42) == 42
+
+
+def test_load_yaml_uses_cache_for_unchanged_content(tmp_path):
+    spec = tmp_path / "spec.yaml"
+    spec.write_text("openapi: 3.0.1\npaths: {}\n", encoding="utf-8")
+    cache = DiskCache(tmp_path / "cache", "specs")
+
+    first = load_yaml(str(spec), cache=cache)
+    second = load_yaml(str(spec), cache=cache)
+    assert first == second == {"openapi": "3.0.1", "paths": {}}
+    assert (cache.misses, cache.hits) == (1, 1)
+    assert second is not first
+
+    spec.write_text("openapi: 3.0.3\npaths: {}\n", encoding="utf-8")
+    assert load_yaml(str(spec), cache=cache)["openapi"] == "3.0.3"
+    assert cache.misses == 2
+
+
+def test_file_digest_is_content_based():
+    assert file_digest(b"a") == file_digest(b"a") != file_digest(b"b")
+
+
+def test_spec_fingerprint_is_type_and_order_sensitive():
+    from api_description_tool.cache import spec_fingerprint
+
+    assert spec_fingerprint({"a": 1, "b": [1, "x"]}) == spec_fingerprint({"a": 1, "b": [1, "x"]})
+    assert spec_fingerprint({200: "ok"}) != spec_fingerprint({"200": "ok"})
+    assert spec_fingerprint({"a": 1}) != spec_fingerprint({"a": True})
+    assert spec_fingerprint({"a": 1, "b": 2}) != spec_fingerprint({"b": 2, "a": 1})
@@ -2,6 +2,7 @@ import sys
 import builtins
 import importlib
 import contextlib
+from pathlib import Path
 
 import pytest
 
@@ -44,9 +45,11 @@ def test_cli_csv_happy_path(
     assert f"Resolved output base: {expected_base}" in out
     assert "Selected format: csv" in out
     assert "Validation enabled: True" in out
+    assert "YAML engine: " in out
     assert "Parameter table rows: 1" in out
     assert "Request body table rows: 3" in out
     assert "Response body table rows: 6" in out
+    assert "$ref resolution cache: " in out
 
 
 def test_cli_skip_validation_and_still_run(
@@ -70,9 +73,12 @@ def test_cli_skip_validation_and_still_run(
     assert f"Resolved output base: {expected_base}" in out
     assert "Selected format: csv" in out
     assert "Validation enabled: False" in out
-    assert "Parameter table rows: 1" in out
-    assert "Request body table rows: 1" in out
-    assert "Response body table rows: 1" in out
+    # CSV tables are streamed: empty ones get just their header line, no placeholder row
+    assert "Parameter table rows: 0" in out
+    assert "Request body table rows: 0" in out
+    assert "Response body table rows: 0" in out
+    lines = (tmp_path / "skipped_params.csv").read_text(encoding="utf-8").splitlines()
+    assert lines == ["Name,Mandatory,Expected Value(s),In,Description,Examples"]
 
 
 def test_cli_missing_yaml_exits_with_error(tmp_path, make_config, monkeypatch):
@@ -82,4 +88,244 @@ def test_cli_missing_yaml_exits_with_error(tmp_path, make_config, monkeypatch):
 
     with pytest.raises(SystemExit) as ei:
         cli.main()
-    assert ei.value.code == 1
\ No newline at end of file
+    assert ei.value.code == 1
+
+
+def test_cli_spec_cache_hit_on_second_run_and_no_cache_switch(
+    tmp_path, valid_openapi_spec_dict, write_yaml, make_config, monkeypatch, capsys
+):
+    cfg = make_config(output={"format": "csv", "file_name": "cached"})
+    spec_path = write_yaml(valid_openapi_spec_dict)
+    monkeypatch.chdir(tmp_path)
+
+    run_cli(monkeypatch, ["prog", str(spec_path), "--config", str(cfg)]).main()
+    assert "Spec cache: miss" in capsys.readouterr().out
+
+    # --force: bypass the build manifest so the spec is actually loaded again
+    run_cli(monkeypatch, ["prog", str(spec_path), "--config", str(cfg), "--force"]).main()
+    assert "Spec cache: hit" in capsys.readouterr().out
+
+    run_cli(monkeypatch, ["prog", str(spec_path), "--config", str(cfg), "--no-cache", "--force"]).main()
+    assert "Spec cache: disabled" in capsys.readouterr().out
+
+
+def test_cli_all_operations_writes_one_output_per_operation(
+    tmp_path, valid_openapi_spec_dict, write_yaml, make_config, monkeypatch, capsys
+):
+    spec = valid_openapi_spec_dict
+    spec["paths"]["/pets/{petId}"] = {
+        "parameters": [{"name": "petId", "in": "path", "required": True, "schema": {"type": "string"}}],
+        "delete": {"responses": {"204": {"description": "gone"}}},
+        "get": {"responses": {"200": {"description": "ok"}}},
+    }
+    cfg = make_config(output={"format": "csv", "file_name": "api_tab_desc"})
+    spec_path = write_yaml(spec)
+    monkeypatch.chdir(tmp_path)
+
+    run_cli(monkeypatch, ["prog", str(spec_path), "batch", "--config", str(cfg), "--all-operations"]).main()
+
+    out = capsys.readouterr().out
+    assert "Batch mode: 3 operations" in out
+    assert out.count("Validation cache:") == 1  # validated once for the whole spec
+    for slug in ("get_pets", "delete_pets_petId", "get_pets_petId"):
+        for suffix in ("_params.csv", "_req_body.csv", "_res_body.csv"):
+            assert (tmp_path / f"batch_{slug}{suffix}").exists()
+    assert "Operation GET /pets: params=1, req=3, res=6" in out
+
+
+def test_operation_slug_is_file_name_friendly(monkeypatch):
+    cli = run_cli(monkeypatch, ["prog"])
+    assert cli._operation_slug("/pets/{petId}/vaccinations", "GET") == "get_pets_petId_vaccinations"
+    assert cli._operation_slug("/", "POST") == "post_root"
+
+
+def test_cli_multi_file_mode_attempts_all_files_then_fails(
+    tmp_path, valid_openapi_spec_dict, invalid_openapi_spec_dict, write_yaml, make_config, monkeypatch, capsys
+):
+    cfg = make_config(output={"format": "csv"})
+    specs = tmp_path / "specs"
+    specs.mkdir()
+    write_yaml(valid_openapi_spec_dict, name="specs/a.yaml")
+    write_yaml(invalid_openapi_spec_dict, name="specs/b.yaml")  # fails validation
+    write_yaml(valid_openapi_spec_dict, name="c.yml")
+    monkeypatch.chdir(tmp_path)
+
+    cli = run_cli(
+        monkeypatch,
+        ["prog", "--inputs", "specs", "*.yml", "--workers", "2", "--output-dir", "out", "--config", str(cfg)],
+    )
+    with pytest.raises(SystemExit) as ei:
+        cli.main()
+    assert ei.value.code == 1
+
+    out = capsys.readouterr().out
+    assert "Input files: 3 (workers: 2)" in out
+    assert "[FAILED] specs/b.yaml" in out and "OpenAPI validation failed" in out
+    assert "Processed 3 files: 2 ok, 1 failed" in out
+    for stem in ("a", "c"):
+        assert (tmp_path / "out" / f"{stem}_api_tab_desc_params.csv").exists()
+    assert not (tmp_path / "out" / "b_api_tab_desc_params.csv").exists()
+
+
+def test_cli_multi_file_mode_all_ok(tmp_path, valid_openapi_spec_dict, write_yaml, make_config, monkeypatch, capsys):
+    cfg = make_config(output={"format": "csv"})
+    spec_path = write_yaml(valid_openapi_spec_dict)
+    monkeypatch.chdir(tmp_path)
+
+    run_cli(monkeypatch, ["prog", "--inputs", str(spec_path), "--workers", "1", "--config", str(cfg)]).main()
+
+    assert "Processed 1 files: 1 ok, 0 failed" in capsys.readouterr().out
+    assert (tmp_path / "spec_api_tab_desc_res_body.csv").exists()
+
+
+def test_expand_inputs_reports_empty_globs_and_dedupes_resolved_paths(tmp_path, monkeypatch):
+    cli = run_cli(monkeypatch, ["prog"])
+    specs = tmp_path / "specs"
+    specs.mkdir()
+    (specs / "a.yaml").write_text("openapi: 3.0.3\n")
+    monkeypatch.chdir(tmp_path)
+
+    found = cli._expand_inputs(["specs/a.yaml", "./specs/a.yaml", "specs", "nothing/*.yaml"])
+    assert [str(p) for p in found] == [str(Path("specs/a.yaml")), "nothing/*.yaml"]
+
+
+def test_cli_manifest_skips_unchanged_outputs(
+    tmp_path, valid_openapi_spec_dict, write_yaml, make_config, monkeypatch, capsys
+):
+    cfg = make_config(output={"format": "csv", "file_name": "inc"})
+    spec_path = write_yaml(valid_openapi_spec_dict)
+    monkeypatch.chdir(tmp_path)
+    argv = ["prog", str(spec_path), "--config", str(cfg)]
+
+    run_cli(monkeypatch, argv).main()
+    assert "Response body table rows" in capsys.readouterr().out
+    assert (tmp_path / ".api_desc_manifest.json").exists()
+
+    run_cli(monkeypatch, argv).main()
+    assert "Up to date, skipping: inc" in capsys.readouterr().out
+
+    # a missing output forces a rebuild
+    (tmp_path / "inc_req_body.csv").unlink()
+    run_cli(monkeypatch, argv).main()
+    assert "Up to date" not in capsys.readouterr().out
+    assert (tmp_path / "inc_req_body.csv").exists()
+
+    # so does --force, and any change to the spec
+    run_cli(monkeypatch, argv + ["--force"]).main()
+    assert "Up to date" not in capsys.readouterr().out
+    valid_openapi_spec_dict["info"]["version"] = "2.0.0"
+    write_yaml(valid_openapi_spec_dict)
+    run_cli(monkeypatch, argv).main()
+    assert "Up to date" not in capsys.readouterr().out
+
+
+def test_cli_xlsx_shards_response_sheet(tmp_path, valid_openapi_spec_dict, write_yaml, make_config, monkeypatch, capsys):
+    import openpyxl
+
+    cfg = make_config(output={"format": "xlsx", "file_name": "sharded", "max_rows_per_sheet": "4"})
+    spec_path = write_yaml(valid_openapi_spec_dict)
+
+    monkeypatch.chdir(tmp_path)
+    run_cli(monkeypatch, ["prog", str(spec_path), "--config", str(cfg)]).main()
+
+    assert "Excel engine: " in capsys.readouterr().out
+    wb = openpyxl.load_workbook(str(tmp_path / "sharded.xlsx"))
+    # 6 response rows at 4 per sheet
+    assert wb.sheetnames == ["Params", "Req Body", "Res Body (1)", "Res Body (2)"]
+    assert wb["Res Body (1)"].max_row + wb["Res Body (2)"].max_row == 6 + 2
+
+
+def test_cli_csv_gzip_compression(tmp_path, valid_openapi_spec_dict, write_yaml, make_config, monkeypatch):
+    import gzip
+
+    cfg = make_config(output={"format": "csv", "file_name": "packed", "compression": "gzip"})
+    spec_path = write_yaml(valid_openapi_spec_dict)
+
+    monkeypatch.chdir(tmp_path)
+    run_cli(monkeypatch, ["prog", str(spec_path), "--config", str(cfg)]).main()
+
+    for suffix in ("_params.csv.gz", "_req_body.csv.gz", "_res_body.csv.gz"):
+        assert (tmp_path / ("packed" + suffix)).exists()
+    assert not (tmp_path / "packed_params.csv").exists()
+    header = gzip.open(tmp_path / "packed_res_body.csv.gz", "rt", encoding="utf-8").readline()
+    assert header.startswith("Status,Path,Property")
+
+
+def test_cli_dash_streams_csv_to_stdout_and_status_to_stderr(
+    tmp_path, valid_openapi_spec_dict, write_yaml, make_config, monkeypatch, capsys
+):
+    import csv
+    import io
+
+    cfg = make_config(output={"format": "xlsx"})
+    spec_path = write_yaml(valid_openapi_spec_dict)
+
+    monkeypatch.chdir(tmp_path)
+    run_cli(monkeypatch, ["prog", str(spec_path), "-", "--config", str(cfg)]).main()
+
+    captured = capsys.readouterr()
+    rows = list(csv.reader(io.StringIO(captured.out)))
+    assert rows[0][:2] == ["Table", "Status"]
+    tables = [r[0] for r in rows[1:]]
+    assert (tables.count("params"), tables.count("req_body"), tables.count("res_body")) == (1, 3, 6)
+    assert f"Input file: {spec_path}" in captured.err
+    assert "Response body table rows: 6" in captured.err
+    # nothing written: no output files, no manifest
+    assert not list(tmp_path.glob("*.csv")) and not list(tmp_path.glob("*.xlsx"))
+    assert not (tmp_path / ".api_desc_manifest.json").exists()
+
+
+def test_cli_dash_streams_chosen_table(tmp_path, valid_openapi_spec_dict, write_yaml, make_config, monkeypatch, capsys):
+    cfg = make_config(output={"stdout_table": "params"})
+    spec_path = write_yaml(valid_openapi_spec_dict)
+
+    monkeypatch.chdir(tmp_path)
+    run_cli(monkeypatch, ["prog", str(spec_path), "-", "--config", str(cfg)]).main()
+
+    captured = capsys.readouterr()
+    lines = captured.out.splitlines()
+    assert lines[0] == "Name,Mandatory,Expected Value(s),In,Description,Examples"
+    assert len(lines) == 2
+    assert "Parameter table rows: 1" in captured.err
+    assert "Response body table rows" not in captured.err
+
+
+def test_cli_dash_only_flattens_the_streamed_table(
+    tmp_path, valid_openapi_spec_dict, write_yaml, make_config, monkeypatch, capsys
+):
+    from api_description_tool import tables
+
+    def fail(*args, **kwargs):
+        raise AssertionError("only the params table may be built")
+
+    cfg = make_config(output={"stdout_table": "params"})
+    spec_path = write_yaml(valid_openapi_spec_dict)
+
+    monkeypatch.chdir(tmp_path)
+    cli = run_cli(monkeypatch, ["prog", str(spec_path), "-", "--config", str(cfg)])
+    monkeypatch.setattr(cli, "build_tables", fail)
+    monkeypatch.setattr(tables, "_operation_request_rows", fail)
+    monkeypatch.setattr(tables, "_operation_response_rows", fail)
+    cli.main()
+
+    assert capsys.readouterr().out.startswith("Name,Mandatory")
+
+
+def test_cli_csv_streams_tables_without_building_them(
+    tmp_path, valid_openapi_spec_dict, write_yaml, make_config, monkeypatch, capsys
+):
+    cfg = make_config(output={"format": "csv", "file_name": "streamed"})
+    spec_path = write_yaml(valid_openapi_spec_dict)
+
+    monkeypatch.chdir(tmp_path)
+    cli = run_cli(monkeypatch, ["prog", str(spec_path), "--config", str(cfg)])
+
+    def fail(*args, **kwargs):
+        raise AssertionError("CSV output must not build whole tables")
+
+    monkeypatch.setattr(cli, "build_tables", fail)
+    cli.main()
+
+    out = capsys.readouterr().out
+    assert "Response body table rows: 6" in out
+    assert len((tmp_path / "streamed_res_body.csv").read_text(encoding="utf-8").splitlines()) == 7
@@ -74,3 +74,89 @@ def test_apply_path_and_method_selects_only_that_operation():
     assert "post" in p1 and "get" not in p1  # only POST kept
     # path-level parameters preserved
     assert "parameters" in p1
+
+REFS_SPEC = {
+    "openapi": "3.0.3",
+    "info": {"title": "x", "version": "1.0.0"},
+    "paths": {
+        "/pets": {
+            "parameters": [{"$ref": "#/components/parameters/Trace"}],
+            "get": {
+                "responses": {
+                    "200": {"$ref": "#/components/responses/PetList"},
+                }
+            },
+            "post": {
+                "requestBody": {"$ref": "#/components/requestBodies/NewPet"},
+                "responses": {"201": {"description": "created"}},
+            },
+        }
+    },
+    "components": {
+        "schemas": {
+            "Pet": {"type": "object", "properties": {"owner": {"$ref": "#/components/schemas/Owner"}}},
+            "Owner": {"type": "object", "properties": {"pets": {"type": "array", "items": {"$ref": "#/components/schemas/Pet"}}}},
+            "NewPet": {"type": "object", "properties": {"name": {"type": "string"}}},
+        },
+        "parameters": {"Trace": {"name": "trace", "in": "header", "schema": {"type": "string"}}},
+        "responses": {
+            "PetList": {
+                "description": "ok",
+                "content": {"application/json": {"schema": {"type": "array", "items": {"$ref": "#/components/schemas/Pet"}}}},
+            }
+        },
+        "requestBodies": {
+            "NewPet": {"content": {"application/json": {"schema": {"$ref": "#/components/schemas/NewPet"}}}}
+        },
+    },
+}
+
+
+def test_apply_tree_shake_keeps_only_reachable_components():
+    out = apply_filters(REFS_SPEC, {"path": "/pets", "method": "GET"}, tree_shake=True)
+    comps = out["components"]
+    assert set(comps["schemas"]) == {"Pet", "Owner"}
+    assert set(comps["parameters"]) == {"Trace"}  # path-level parameters count as roots
+    assert set(comps["responses"]) == {"PetList"}
+    assert "requestBodies" not in comps
+    # input spec keeps everything
+    assert set(REFS_SPEC["components"]["requestBodies"]) == {"NewPet"}
+
+
+def test_apply_tree_shake_off_by_default():
+    out = apply_filters(REFS_SPEC, {"path": "/pets", "method": "POST"})
+    assert out["components"] == REFS_SPEC["components"]
+
+
+def test_reachable_components_groups_by_section():
+    from api_description_tool.refs import reachable_components
+
+    pruned = apply_filters(REFS_SPEC, {"path": "/pets", "method": "POST"})
+    assert reachable_components(pruned) == {
+        "parameters": {"Trace"},
+        "requestBodies": {"NewPet"},
+        "schemas": {"NewPet"},
+    }
+
+
+def test_apply_filters_is_copy_free_and_does_not_mutate_inputs():
+    from copy import deepcopy
+
+    snapshot = deepcopy(REFS_SPEC)
+    rules = {"path": "/pets", "method": "get"}
+    out = apply_filters(REFS_SPEC, rules)
+
+    assert REFS_SPEC == snapshot
+    assert rules == {"path": "/pets", "method": "get"}
+    # new containers along the selection only; everything else is shared
+    assert out is not REFS_SPEC and out["paths"] is not REFS_SPEC["paths"]
+    assert out["components"] is REFS_SPEC["components"]
+    assert out["info"] is REFS_SPEC["info"]
+    assert out["paths"]["/pets"]["get"] is REFS_SPEC["paths"]["/pets"]["get"]
+    assert out["paths"]["/pets"]["parameters"] is REFS_SPEC["paths"]["/pets"]["parameters"]
+
+
+def test_apply_filters_passthrough_returns_new_top_level_dict():
+    out = apply_filters(MIN_SPEC, {})
+    assert out == MIN_SPEC and out is not MIN_SPEC
+    assert out["paths"] is MIN_SPEC["paths"]
@@ -0,0 +1,288 @@
+from api_description_tool.flattener import ResolutionContext, extract_constraints, flatten_for_table, iter_flattened_rows
+from api_description_tool.rows import ResponseRow
+
+
+def _tree_spec():
+    """Node -> children[] -> Node (self-cycle) and A <-> B (two-node cycle)."""
+    return {
+        "components": {
+            "schemas": {
+                "Node": {
+                    "type": "object",
+                    "required": ["id"],
+                    "properties": {
+                        "id": {"type": "string"},
+                        "children": {"type": "array", "items": {"$ref": "#/components/schemas/Node"}},
+                    },
+                },
+                "A": {"type": "object", "properties": {"name": {"type": "string"}, "b": {"$ref": "#/components/schemas/B"}}},
+                "B": {"type": "object", "properties": {"code": {"type": "integer"}, "a": {"$ref": "#/components/schemas/A"}}},
+            }
+        }
+    }
+
+
+def test_recursive_refs_from_scc_analysis():
+    ctx = ResolutionContext.for_spec(_tree_spec())
+    assert ctx.recursive_refs == {
+        "#/components/schemas/Node",
+        "#/components/schemas/A",
+        "#/components/schemas/B",
+    }
+
+
+def test_flatten_stops_at_self_recursive_schema_with_marker_row():
+    spec = _tree_spec()
+    rows = flatten_for_table({"$ref": "#/components/schemas/Node"}, ctx=ResolutionContext.for_spec(spec))
+    assert [(r["Path"], r["Property"], r["Expected Value(s)"]) for r in rows] == [
+        ("", "id", "string"),
+        ("/children[0]", "", "object circular=Node"),
+    ]
+
+
+def test_flatten_stops_at_mutual_recursion():
+    spec = _tree_spec()
+    rows = flatten_for_table({"$ref": "#/components/schemas/A"}, ctx=ResolutionContext.for_spec(spec))
+    assert [(r["Path"], r["Property"]) for r in rows] == [
+        ("", "name"),
+        ("/b", "code"),
+        ("/b/a", ""),
+    ]
+    assert rows[-1]["Expected Value(s)"] == "object circular=A"
+
+
+def test_flatten_without_ctx_uses_components():
+    spec = _tree_spec()
+    rows = flatten_for_table({"$ref": "#/components/schemas/Node"}, components=spec["components"])
+    assert rows[-1]["Expected Value(s)"] == "object circular=Node"
+
+
+def test_extract_constraints_marks_circular_stub():
+    assert extract_constraints({"type": "object", "x-circular": "#/components/schemas/Node"}) == "object circular=Node"
+
+
+def _money_spec():
+    money = {
+        "type": "object",
+        "required": ["amount"],
+        "properties": {
+            "amount": {"type": "number"},
+            "currency": {"type": "object", "properties": {"code": {"type": "string", "enum": ["EUR", "USD"]}}},
+        },
+    }
+    root = {
+        "type": "object",
+        "properties": {
+            "price": {"$ref": "#/components/schemas/Money"},
+            "fees": {"type": "array", "items": {"$ref": "#/components/schemas/Money"}},
+            "nested": {
+                "type": "object",
+                "properties": {"deep": {"type": "object", "properties": {"price": {"$ref": "#/components/schemas/Money"}}}},
+            },
+        },
+    }
+    return {"components": {"schemas": {"Money": money}}}, root
+
+
+def test_flatten_memo_rebases_repeated_components():
+    spec, root = _money_spec()
+    ctx = ResolutionContext.for_spec(spec)
+    rows = flatten_for_table(root, ctx=ctx)
+    assert [(r["Path"], r["Property"], r["Mandatory"]) for r in rows] == [
+        ("/price", "amount", True),
+        ("/price/currency", "code", False),
+        ("/fees[0]", "amount", True),
+        ("/fees[0]/currency", "code", False),
+        ("/nested/deep/price", "amount", True),
+        ("/nested/deep/price/currency", "code", False),
+    ]
+    assert ctx.memo_hits == 2 and ctx.memo_misses == 1
+    # a second call on the same context is served from the memo, and rows are fresh objects
+    again = flatten_for_table(root, ctx=ctx)
+    assert again == rows and all(a is not b for a, b in zip(again, rows))
+    assert ctx.memo_hits == 5
+
+
+def test_flatten_memo_keyed_by_inherited_mandatory():
+    spec, _ = _money_spec()
+    root = {
+        "type": "object",
+        "properties": {
+            "optional": {"type": "array", "items": {"$ref": "#/components/schemas/Money"}},
+            "required": {"type": "array", "minItems": 1, "items": {"$ref": "#/components/schemas/Money"}},
+        },
+    }
+    rows = flatten_for_table(root, ctx=ResolutionContext.for_spec(spec))
+    mand = {(r["Path"], r["Property"]): r["Mandatory"] for r in rows}
+    assert mand[("/optional[0]/currency", "code")] is False
+    assert mand[("/required[0]/currency", "code")] is True
+
+
+def test_flatten_memo_respects_depth_budget():
+    spec, root = _money_spec()
+    del root["properties"]["fees"]
+    rows = flatten_for_table(root, ctx=ResolutionContext.for_spec(spec), max_depth=3)
+    # at depth 3 the cached Money rows (1 level deep) would overrun the budget, so it is walked again
+    assert [(r["Path"], r["Property"]) for r in rows] == [
+        ("/price", "amount"),
+        ("/price/currency", "code"),
+        ("/nested/deep/price", "amount"),
+    ]
+
+
+def _chain(depth):
+    """Object nested `depth` levels deep: /l1/l2/.../leaf."""
+    schema = {"type": "object", "properties": {"leaf": {"type": "string"}}}
+    for i in range(depth, 0, -1):
+        schema = {"type": "object", "properties": {f"l{i}": schema}}
+    return schema
+
+
+def test_flatten_depth_budget_reports_truncation():
+    ctx = ResolutionContext.for_spec({})
+    assert flatten_for_table(_chain(30), ctx=ctx) == []
+    assert ctx.depth_truncations and ctx.depth_truncations[0].startswith("/l1/l2")
+
+
+def test_flatten_unlimited_depth_walks_deep_schemas():
+    ctx = ResolutionContext.for_spec({})
+    rows = flatten_for_table(_chain(2000), ctx=ctx, max_depth=None)
+    assert len(rows) == 1 and rows[0]["Property"] == "leaf"
+    assert rows[0]["Path"].count("/") == 2000
+    assert ctx.depth_truncations == []
+
+
+def test_iter_flattened_rows_is_lazy_and_caller_may_update_rows():
+    spec, root = _money_spec()
+    ctx = ResolutionContext.for_spec(spec)
+    it = iter_flattened_rows(root, ctx=ctx, row_type=ResponseRow)
+    first = next(it)
+    assert (first["Path"], first["Property"], first["Status"]) == ("/price", "amount", "")
+    rows = [first] + list(it)
+    for row in rows:
+        row["Status"] = "200"
+    # the memo keeps its own copies, so later calls are unaffected by the caller's edits
+    assert {r["Status"] for r in flatten_for_table(root, ctx=ctx, row_type=ResponseRow)} == {""}
+    assert all("Status" not in r for r in flatten_for_table(root, ctx=ctx))
+
+
+def test_constraint_cache_reuses_strings_per_schema_object():
+    shared = {"type": "string", "enum": ["a", "b"]}
+    ctx = ResolutionContext.for_spec({})
+    assert ctx.constraints(shared) == "string enum=a,b"
+    assert ctx.constraints(shared) == "string enum=a,b"
+    assert ctx.constraints({"type": "string", "enum": ["a", "b"]}) == "string enum=a,b"
+    assert (ctx.constraint_hits, ctx.constraint_misses) == (1, 2)
+
+    off = ResolutionContext.for_spec({}, cache_constraints=False)
+    assert off.constraints(shared) == "string enum=a,b"
+    assert off.constraint_cache is None and off.stats()["constraint_misses"] == 0
+
+
+def test_composite_merge_cached_per_node():
+    spec = {
+        "components": {
+            "schemas": {
+                "Base": {"type": "object", "required": ["id"], "properties": {"id": {"type": "string"}}},
+            }
+        }
+    }
+    shared = {"allOf": [{"$ref": "#/components/schemas/Base"}, {"properties": {"note": {"type": "string"}}}]}
+    root = {"type": "object", "properties": {"a": shared, "b": shared}}
+    ctx = ResolutionContext.for_spec(spec)
+    rows = flatten_for_table(root, ctx=ctx)
+    assert [(r["Path"], r["Property"], r["Mandatory"]) for r in rows] == [
+        ("/a", "id", True),
+        ("/a", "note", False),
+        ("/b", "id", True),
+        ("/b", "note", False),
+    ]
+    assert (ctx.stats()["merge_hits"], ctx.stats()["merge_misses"]) == (1, 1)
+
+
+def test_flatten_stops_at_cycle_through_inline_path_schema_with_unlimited_depth():
+    inline = "#/paths/~1a/get/responses/200/content/application~1json/schema"
+    root = {"type": "object", "properties": {"id": {"type": "string"}, "r": {"$ref": "#/components/schemas/R"}}}
+    spec = {
+        "paths": {"/a": {"get": {"responses": {"200": {"content": {"application/json": {"schema": root}}}}}}},
+        "components": {"schemas": {"R": {"type": "object", "properties": {"back": {"$ref": inline}}}}},
+    }
+    rows = flatten_for_table({"$ref": inline}, ctx=ResolutionContext.for_spec(spec), max_depth=None)
+    assert [(r["Path"], r["Property"]) for r in rows] == [
+        ("", "id"),
+        ("/r/back", ""),
+    ]
+    assert rows[-1]["Expected Value(s)"].startswith("object circular=")
+
+
+def test_flatten_unlimited_depth_stops_at_yaml_self_alias():
+    import yaml
+
+    spec = yaml.safe_load(
+        """
+components:
+  schemas:
+    Node: &n
+      type: object
+      properties:
+        id: {type: string}
+        next: *n
+"""
+    )
+    ctx = ResolutionContext.for_spec(spec)
+    rows = flatten_for_table({"$ref": "#/components/schemas/Node"}, ctx=ctx, max_depth=None)
+    assert [(r["Path"], r["Property"], r["Expected Value(s)"]) for r in rows] == [
+        ("", "id", "string"),
+        ("/next", "", "object circular=next"),
+    ]
+    # the guard is only needed without a budget; with one the depth limit cuts the chain
+    assert len(flatten_for_table({"$ref": "#/components/schemas/Node"}, ctx=ResolutionContext.for_spec(spec), max_depth=3)) == 4
+
+
+def test_flatten_stops_at_recursion_through_all_of():
+    spec = {
+        "components": {
+            "schemas": {
+                "Node": {
+                    "type": "object",
+                    "properties": {
+                        "id": {"type": "string"},
+                        "child": {"allOf": [{"$ref": "#/components/schemas/Node"}]},
+                    },
+                }
+            }
+        }
+    }
+    ctx = ResolutionContext.for_spec(spec)
+    assert ctx.recursive_refs == {"#/components/schemas/Node"}
+    rows = flatten_for_table({"$ref": "#/components/schemas/Node"}, ctx=ctx)
+    assert [(r["Path"], r["Property"], r["Expected Value(s)"]) for r in rows] == [
+        ("", "id", "string"),
+        ("/child", "", "object circular=Node"),
+    ]
+    assert not ctx.depth_truncations
+
+
+def test_flatten_stops_at_branching_recursion_through_one_of():
+    spec = {
+        "components": {
+            "schemas": {
+                "Expr": {
+                    "type": "object",
+                    "properties": {
+                        "op": {"type": "string"},
+                        "left": {"oneOf": [{"$ref": "#/components/schemas/Expr"}, {"$ref": "#/components/schemas/Leaf"}]},
+                        "right": {"oneOf": [{"$ref": "#/components/schemas/Expr"}, {"$ref": "#/components/schemas/Leaf"}]},
+                    },
+                },
+                "Leaf": {"type": "object", "properties": {"value": {"type": "number"}}},
+            }
+        }
+    }
+    ctx = ResolutionContext.for_spec(spec)
+    rows = flatten_for_table({"$ref": "#/components/schemas/Expr"}, ctx=ctx, max_depth=None)
+    assert [(r["Path"], r["Property"], r["Expected Value(s)"]) for r in rows] == [
+        ("", "op", "string"),
+        ("/left", "", "object circular=Expr"),
+        ("/right", "", "object circular=Expr"),
+    ]
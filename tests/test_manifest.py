@@ -0,0 +1,87 @@
+import json
+
+from api_description_tool.manifest import MANIFEST_NAME, Manifest, build_fingerprint
+
+
+CFG = {"input": {"validate": "True"}, "output": {"format": "csv"}, "filtering": {}, "cache": {"dir": "/tmp/x"}}
+
+
+def test_fingerprint_tracks_input_config_and_options():
+    fp = build_fingerprint("abc", CFG)
+    assert fp == build_fingerprint("abc", CFG)
+    assert fp != build_fingerprint("abd", CFG)
+    assert fp != build_fingerprint("abc", {**CFG, "output": {"format": "xlsx"}})
+    assert fp != build_fingerprint("abc", CFG, all_operations=True)
+    # sections that do not shape outputs are ignored
+    assert fp == build_fingerprint("abc", {**CFG, "cache": {"dir": "/elsewhere"}})
+    # [tables] options that change the rows count; those that only change how they are built do not
+    assert fp != build_fingerprint("abc", {**CFG, "tables": {"max_depth": "none"}})
+    assert fp == build_fingerprint("abc", {**CFG, "tables": {"workers": "4", "parallel_min_operations": "10"}})
+    assert fp == build_fingerprint("abc", {**CFG, "output": {**CFG.get("output", {}), "stdout_table": "params"}})
+
+
+def test_manifest_roundtrip_and_freshness(tmp_path):
+    out = tmp_path / "out.xlsx"
+    out.write_text("x")
+    m = Manifest(tmp_path)
+    assert not m.is_fresh("out", "fp")
+    m.record("out", "fp", [out])
+    m.save()
+
+    data = json.loads((tmp_path / MANIFEST_NAME).read_text())
+    assert data["outputs"]["out"] == {"fingerprint": "fp", "files": ["out.xlsx"]}
+
+    reloaded = Manifest(tmp_path)
+    assert reloaded.is_fresh("out", "fp")
+    assert not reloaded.is_fresh("out", "other")
+    out.unlink()
+    assert not reloaded.is_fresh("out", "fp")
+
+
+def test_manifest_save_merges_concurrent_entries(tmp_path):
+    a, b = Manifest(tmp_path), Manifest(tmp_path)
+    a.record("a", "1", [tmp_path / "a.csv"])
+    b.record("b", "2", [tmp_path / "b.csv"])
+    a.save()
+    b.save()
+    assert set(Manifest(tmp_path).entries) == {"a", "b"}
+
+
+def test_manifest_ignores_corrupt_file(tmp_path):
+    (tmp_path / MANIFEST_NAME).write_text("{not json")
+    assert Manifest(tmp_path).entries == {}
+
+
+def _save_entries(directory, start, count):
+    for i in range(start, start + count):
+        m = Manifest(directory)
+        m.record(f"out{i}", "fp", [directory / f"out{i}.csv"])
+        m.save()
+
+
+def test_manifest_save_is_safe_across_processes(tmp_path):
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        list(pool.map(_save_entries, [tmp_path] * 4, range(0, 80, 20), [20] * 4))
+    assert set(Manifest(tmp_path).entries) == {f"out{i}" for i in range(80)}
+    assert not (tmp_path / (MANIFEST_NAME + ".lock")).exists()
+
+
+def test_manifest_save_breaks_stale_lock(tmp_path):
+    import os
+
+    lock = tmp_path / (MANIFEST_NAME + ".lock")
+    lock.write_text("")
+    os.utime(lock, (0, 0))
+    m = Manifest(tmp_path)
+    m.record("a", "1", [tmp_path / "a.csv"])
+    m.save()
+    assert Manifest(tmp_path).entries["a"]["fingerprint"] == "1"
+    assert not lock.exists()
+
+
+def test_version_is_single_sourced_from_pyproject():
+    from api_description_tool import __version__, _source_version
+
+    assert __version__ == _source_version() != "0+unknown"
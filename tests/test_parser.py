@@ -1,3 +1,5 @@
+from pathlib import Path
+
 import pytest
 from api_description_tool.parser import load_yaml, validate_openapi
 
@@ -21,4 +23,88 @@ def test_validate_openapi_valid(valid_openapi_spec_dict):
 
 def test_validate_openapi_invalid(invalid_openapi_spec_dict):
     with pytest.raises(ValueError):
-        validate_openapi(invalid_openapi_spec_dict)
\ No newline at end of file
+        validate_openapi(invalid_openapi_spec_dict)
+
+
+def test_resolve_yaml_engine_auto_and_python():
+    from api_description_tool.parser import LIBYAML_AVAILABLE, resolve_yaml_engine
+
+    assert resolve_yaml_engine("auto") == ("libyaml" if LIBYAML_AVAILABLE else "python")
+    assert resolve_yaml_engine("python") == "python"
+    with pytest.raises(ValueError):
+        resolve_yaml_engine("turbo")
+
+
+def test_resolve_yaml_engine_libyaml_missing(monkeypatch):
+    from api_description_tool import parser
+
+    monkeypatch.setattr(parser, "LIBYAML_AVAILABLE", False)
+    assert parser.resolve_yaml_engine("auto") == "python"
+    with pytest.raises(ValueError):
+        parser.resolve_yaml_engine("libyaml")
+
+
+@pytest.mark.parametrize(
+    "spec_file", sorted((Path(__file__).parent / "data").glob("*.y*ml")), ids=lambda p: p.name
+)
+def test_load_yaml_engines_produce_identical_dicts(spec_file):
+    from api_description_tool.parser import LIBYAML_AVAILABLE
+
+    if not LIBYAML_AVAILABLE:
+        pytest.skip("PyYAML built without libyaml")
+    assert load_yaml(str(spec_file), engine="libyaml") == load_yaml(str(spec_file), engine="python")
+
+
+def test_validate_openapi_cache_skips_validator_on_repeat(valid_openapi_spec_dict, tmp_path, monkeypatch):
+    from api_description_tool import parser
+    from api_description_tool.cache import DiskCache
+
+    cache = DiskCache(tmp_path, "validation")
+    assert validate_openapi(valid_openapi_spec_dict, cache=cache) is True
+
+    def boom(spec):
+        raise AssertionError("validator should not run for a cached spec")
+
+    monkeypatch.setattr(parser, "validate_spec", boom)
+    assert validate_openapi(valid_openapi_spec_dict, cache=cache) is True
+    assert cache.hits == 1
+
+
+def test_validate_openapi_cache_replays_identical_failure(invalid_openapi_spec_dict, tmp_path, monkeypatch):
+    from api_description_tool import parser
+    from api_description_tool.cache import DiskCache
+
+    cache = DiskCache(tmp_path, "validation")
+    with pytest.raises(ValueError) as first:
+        validate_openapi(invalid_openapi_spec_dict, cache=cache)
+
+    monkeypatch.setattr(parser, "validate_spec", lambda spec: pytest.fail("validator should not run"))
+    with pytest.raises(ValueError) as second:
+        validate_openapi(invalid_openapi_spec_dict, cache=cache)
+    assert str(second.value) == str(first.value)
+
+
+def test_validate_openapi_cache_misses_when_spec_changes(valid_openapi_spec_dict, tmp_path):
+    from api_description_tool.cache import DiskCache
+
+    cache = DiskCache(tmp_path, "validation")
+    validate_openapi(valid_openapi_spec_dict, cache=cache)
+    valid_openapi_spec_dict["info"]["version"] = "2.0.0"
+    validate_openapi(valid_openapi_spec_dict, cache=cache)
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_validate_openapi_scoped_ignores_unreachable_components(valid_openapi_spec_dict):
+    spec = valid_openapi_spec_dict
+    # an unused, invalid component: fails full validation but is outside the operation's scope
+    spec["components"]["schemas"]["Broken"] = {"type": "object", "required": "not-a-list"}
+    with pytest.raises(ValueError):
+        validate_openapi(spec)
+    assert validate_openapi(spec, scoped=True) is True
+
+
+def test_validate_openapi_scoped_still_checks_reachable_components(valid_openapi_spec_dict):
+    spec = valid_openapi_spec_dict
+    spec["components"]["schemas"]["PetRequest"]["required"] = "not-a-list"
+    with pytest.raises(ValueError):
+        validate_openapi(spec, scoped=True)
@@ -0,0 +1,153 @@
+from api_description_tool.refs import (
+    iter_refs,
+    prune_components,
+    reachable_refs,
+    resolve_pointer,
+)
+
+
+SPEC = {
+    "openapi": "3.0.3",
+    "info": {"title": "x", "version": "1"},
+    "paths": {
+        "/a": {
+            "get": {
+                "parameters": [{"$ref": "#/components/parameters/Limit"}],
+                "responses": {
+                    "200": {
+                        "description": "ok",
+                        "content": {"application/json": {"schema": {"$ref": "#/components/schemas/A"}}},
+                    }
+                },
+            }
+        }
+    },
+    "components": {
+        "schemas": {
+            "A": {"type": "object", "properties": {"b": {"$ref": "#/components/schemas/B"}}},
+            "B": {"type": "object", "properties": {"a": {"$ref": "#/components/schemas/A"}, "c": {"$ref": "#/components/schemas/C/properties/x"}}},
+            "C": {"type": "object", "properties": {"x": {"type": "string"}, "d": {"$ref": "#/components/schemas/D"}}},
+            "D": {"type": "string"},
+            "Unused": {"type": "object", "properties": {"u": {"$ref": "#/components/schemas/D"}}},
+            "a/b~c": {"type": "integer"},
+        },
+        "parameters": {
+            "Limit": {"name": "limit", "in": "query", "schema": {"type": "integer"}},
+            "Offset": {"name": "offset", "in": "query", "schema": {"type": "integer"}},
+        },
+        "securitySchemes": {"key": {"type": "apiKey", "name": "k", "in": "header"}},
+    },
+}
+
+
+def test_resolve_pointer_handles_escapes_and_percent_encoding():
+    assert resolve_pointer(SPEC, "#/components/schemas/a~1b~0c") == {"type": "integer"}
+    assert resolve_pointer(SPEC, "#/paths/~1a/get/parameters/0") == {"$ref": "#/components/parameters/Limit"}
+    assert resolve_pointer(SPEC, "#/components/schemas/a~1b%7Ec") == {"type": "integer"}
+    assert resolve_pointer(SPEC, "#/components/schemas/Missing") is None
+    assert resolve_pointer(SPEC, "other.yaml#/x") is None
+
+
+def test_iter_refs_finds_nested_refs():
+    assert set(iter_refs(SPEC["components"]["schemas"]["B"])) == {
+        "#/components/schemas/A",
+        "#/components/schemas/C/properties/x",
+    }
+
+
+def test_reachable_refs_is_transitive_and_cycle_safe():
+    refs = reachable_refs(SPEC)
+    assert refs == {
+        "#/components/parameters/Limit",
+        "#/components/schemas/A",
+        "#/components/schemas/B",
+        "#/components/schemas/C",
+        "#/components/schemas/D",
+    }
+
+
+def test_prune_components_keeps_reachable_and_unaddressed_sections():
+    pruned = prune_components(SPEC, reachable_refs(SPEC))
+    comps = pruned["components"]
+    assert set(comps["schemas"]) == {"A", "B", "C", "D"}
+    assert set(comps["parameters"]) == {"Limit"}
+    assert comps["securitySchemes"] is SPEC["components"]["securitySchemes"]
+    assert comps["schemas"]["A"] is SPEC["components"]["schemas"]["A"]
+    # input untouched
+    assert "Unused" in SPEC["components"]["schemas"]
+
+
+def test_pointer_index_matches_resolve_pointer_for_every_node():
+    from api_description_tool.refs import PointerIndex
+
+    index = PointerIndex(SPEC)
+    assert index.get("#") is SPEC
+    assert index.get("#/components/schemas/a~1b~0c") is SPEC["components"]["schemas"]["a/b~c"]
+    assert index.get("#/components/schemas/a~1b%7E0c") is SPEC["components"]["schemas"]["a/b~c"]
+    assert index.get("#/paths/~1a/get/parameters/0") is SPEC["paths"]["/a"]["get"]["parameters"][0]
+    assert index.get("#/components/schemas/Nope") is None
+    assert index.get("other.yaml#/x") is None
+
+
+def test_pointer_index_handles_int_keys_and_shared_nodes():
+    from api_description_tool.refs import PointerIndex
+
+    shared = {"type": "string"}
+    doc = {"responses": {200: {"description": "ok"}}, "a": shared, "b": {"inner": shared}}
+    doc["self"] = doc  # recursive YAML alias
+    index = PointerIndex(doc)
+    assert index.get("#/responses/200") == {"description": "ok"}
+    assert resolve_pointer(doc, "#/responses/200") == {"description": "ok"}
+    assert index.get("#/a") is shared and index.get("#/b/inner") is shared
+    assert index.get("#/self/a") is shared  # falls back to a walk through the alias
+
+
+def test_strongly_connected_components_and_recursive_refs():
+    from api_description_tool.refs import recursive_refs, ref_graph, strongly_connected_components
+
+    graph = {"a": {"b"}, "b": {"c", "a"}, "c": set(), "d": {"d"}, "e": {"a"}}
+    sccs = {frozenset(c) for c in strongly_connected_components(graph)}
+    assert sccs == {frozenset({"a", "b"}), frozenset({"c"}), frozenset({"d"}), frozenset({"e"})}
+
+    assert ref_graph(SPEC)["#/components/schemas/B"] == {"#/components/schemas/A", "#/components/schemas/C"}
+    assert recursive_refs(SPEC) == {"#/components/schemas/A", "#/components/schemas/B"}
+
+
+def test_strongly_connected_components_long_chain_is_not_recursive():
+    from api_description_tool.refs import strongly_connected_components
+
+    graph = {str(i): {str(i + 1)} for i in range(5000)}
+    assert len(strongly_connected_components(graph)) == 5001
+
+
+def test_recursive_refs_follow_cycles_through_non_component_targets():
+    from api_description_tool.refs import recursive_refs
+
+    inline = "#/paths/~1a/get/responses/200/content/application~1json/schema"
+    spec = {
+        "paths": {
+            "/a": {
+                "get": {
+                    "responses": {
+                        "200": {
+                            "content": {
+                                "application/json": {
+                                    "schema": {"type": "object", "properties": {"r": {"$ref": "#/components/schemas/R"}}}
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        },
+        "components": {"schemas": {"R": {"type": "object", "properties": {"back": {"$ref": inline}}}}},
+    }
+    assert recursive_refs(spec) == {"#/components/schemas/R", inline}
+
+
+def test_ref_tokens_decodes_local_pointers():
+    from api_description_tool.refs import ref_tokens
+
+    assert ref_tokens("#/paths/~1a~0b/get") == ["paths", "/a~b", "get"]
+    assert ref_tokens("#") == []
+    assert ref_tokens("other.yaml#/x") is None
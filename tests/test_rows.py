@@ -0,0 +1,38 @@
+import pickle
+
+from api_description_tool.rows import BodyRow, ParamRow, ResponseRow, row_values
+from api_description_tool.writer_excel import PARAMS_HEADERS, REQ_HEADERS, RES_HEADERS
+
+
+def test_headers_match_writer_columns():
+    assert list(ParamRow.HEADERS) == PARAMS_HEADERS
+    assert list(BodyRow.HEADERS) == REQ_HEADERS
+    assert list(ResponseRow.HEADERS) == RES_HEADERS
+
+
+def test_row_is_a_dict_compatible_mapping():
+    row = ResponseRow("/a", "id", True, "integer", "the id", "1", status="200")
+    assert row["Property"] == "id" and row.get("Missing", "x") == "x"
+    assert list(row) == ["Status", "Path", "Property", "Mandatory", "Expected Value(s)", "Description", "Examples"]
+    assert dict(row) == {
+        "Status": "200", "Path": "/a", "Property": "id", "Mandatory": True,
+        "Expected Value(s)": "integer", "Description": "the id", "Examples": "1",
+    }
+    assert row == dict(row)
+    row["Status"] = "404"
+    assert row.status == "404"
+    assert not hasattr(row, "__dict__")
+
+
+def test_row_copy_rebase_and_pickle():
+    row = BodyRow("/a", "id", True, "integer", "", "")
+    moved = row.rebased("/b/a")
+    assert moved["Path"] == "/b/a" and row["Path"] == "/a"
+    assert pickle.loads(pickle.dumps(row)) == row
+
+
+def test_row_values_fast_path_and_dicts():
+    row = ParamRow("x", True, "string", "query", "", "")
+    assert row_values(row, ParamRow.HEADERS) == ("x", True, "string", "query", "", "")
+    assert row_values(row, ["In", "Name"]) == ("query", "x")
+    assert row_values({"Name": "y"}, ("Name", "In")) == ("y", "")
@@ -2,8 +2,14 @@ from api_description_tool.tables import (
     build_request_params_table,
     build_request_body_table,
     build_response_body_table,
+    build_tables,
     extract_constraints,
+    iter_request_body_rows,
+    iter_request_params_rows,
+    iter_response_body_rows,
+    resolution_context,
 )
+from api_description_tool.tables import _iter_operations, _operations_document
 
 
 def test_request_params_table(valid_openapi_spec_dict):
@@ -94,3 +100,134 @@ def test_response_body_array_minitems_sets_mandatory(valid_openapi_spec_dict):
         if row.get("Status") == "200" and row["Path"] == "/kinds[0]" and row["Property"] == ""
     )
     assert target["Mandatory"] is True
+
+
+def test_table_builders_treat_spec_as_read_only(valid_openapi_spec_dict):
+    # filtering shares subtrees with the loaded spec, so builders must never mutate it
+    from copy import deepcopy
+
+    snapshot = deepcopy(valid_openapi_spec_dict)
+    build_request_params_table(valid_openapi_spec_dict, config={})
+    build_request_body_table(valid_openapi_spec_dict, config={})
+    build_response_body_table(valid_openapi_spec_dict, config={})
+    assert valid_openapi_spec_dict == snapshot
+
+
+def test_shared_resolution_context_resolves_each_ref_once(valid_openapi_spec_dict):
+    from api_description_tool.flattener import ResolutionContext
+
+    spec = valid_openapi_spec_dict
+    # the same component used by request and both responses
+    spec["paths"]["/pets"]["get"]["responses"]["default"]["content"]["application/json"]["schema"] = {
+        "$ref": "#/components/schemas/PetResponse"
+    }
+    ctx = ResolutionContext.for_spec(spec)
+    expected = build_response_body_table(spec, config={})
+
+    build_request_params_table(spec, config={}, ctx=ctx)
+    build_request_body_table(spec, config={}, ctx=ctx)
+    assert build_response_body_table(spec, config={}, ctx=ctx) == expected
+    assert ctx.misses == 2  # PetRequest, PetResponse
+    assert ctx.hits >= 1
+    assert ctx.stats()["hits"] == ctx.hits and ctx.stats()["misses"] == ctx.misses
+
+
+def test_refs_outside_components_and_escaped_names_resolve(valid_openapi_spec_dict):
+    spec = valid_openapi_spec_dict
+    schemas = spec["components"]["schemas"]
+    schemas["Pet/Response~v2"] = schemas.pop("PetResponse")
+    ok = spec["paths"]["/pets"]["get"]["responses"]["200"]["content"]["application/json"]
+    ok["schema"] = {"$ref": "#/components/schemas/Pet~1Response~0v2"}
+    # a ref into paths/ (not components/)
+    spec["paths"]["/pets"]["get"]["responses"]["default"]["content"]["application/json"]["schema"] = {
+        "$ref": "#/paths/~1pets/get/responses/200/content/application~1json/schema"
+    }
+
+    rows = build_response_body_table(spec, config={})
+    assert {r["Status"] for r in rows if r["Property"] == "id"} == {"200", "default"}
+
+
+def test_tables_max_depth_from_config(valid_openapi_spec_dict):
+    shallow = build_request_body_table(valid_openapi_spec_dict, config={"tables": {"max_depth": "0"}})
+    unlimited = build_request_body_table(valid_openapi_spec_dict, config={"tables": {"max_depth": "none"}})
+    assert all(r["Path"] == "" for r in shallow)
+    assert unlimited == build_request_body_table(valid_openapi_spec_dict, config={})
+
+
+def test_iter_rows_match_built_tables(valid_openapi_spec_dict):
+    spec = valid_openapi_spec_dict
+    for iter_rows, build in (
+            (iter_request_params_rows, build_request_params_table),
+            (iter_request_body_rows, build_request_body_table),
+            (iter_response_body_rows, build_response_body_table),
+    ):
+        rows = iter_rows(spec, {})
+        assert not isinstance(rows, list)
+        assert list(rows) == build(spec, {})
+
+
+def test_constraint_cache_option(valid_openapi_spec_dict):
+    spec = valid_openapi_spec_dict
+    on = resolution_context(spec, {})
+    off = resolution_context(spec, {"tables": {"constraint_cache": "False"}})
+    assert on.constraint_cache is not None and off.constraint_cache is None
+    assert build_response_body_table(spec, {}, on) == build_response_body_table(spec, {}, off)
+
+
+def test_build_tables_matches_separate_builders(valid_openapi_spec_dict):
+    spec = valid_openapi_spec_dict
+    params, req_body, res_body = build_tables(spec, {})
+    assert params == build_request_params_table(spec, {})
+    assert req_body == build_request_body_table(spec, {})
+    assert res_body == build_response_body_table(spec, {})
+
+
+def _many_operations_spec(n):
+    item = {
+        "type": "object",
+        "required": ["id"],
+        "properties": {"id": {"type": "integer"}, "tags": {"type": "array", "items": {"type": "string"}}},
+    }
+    paths = {}
+    for i in range(n):
+        paths[f"/items/{i}"] = {
+            "get": {
+                "parameters": [{"$ref": "#/paths/~1items~10/get/x-shared-param"}] if i else [{"name": "q", "in": "query"}],
+                "responses": {"200": {"content": {"application/json": {"schema": {"$ref": "#/components/schemas/Item"}}}}},
+                **({"x-shared-param": {"name": "q", "in": "query", "schema": {"type": "string"}}} if i == 0 else {}),
+            },
+            "post": {
+                "requestBody": {"content": {"application/json": {"schema": {"$ref": "#/components/schemas/Item"}}}},
+                "responses": {"201": {"description": "created"}},
+            },
+        }
+    return {"paths": paths, "components": {"schemas": {"Item": item, "Unused": {"type": "string"}}}}
+
+
+def test_build_tables_parallel_matches_serial():
+    spec = _many_operations_spec(12)
+    serial = build_tables(spec, {})
+    config = {"tables": {"workers": "2", "parallel_min_operations": "4"}}
+    ctx = resolution_context(spec, config)
+    assert build_tables(spec, config, ctx) == serial
+    assert ctx.stats()["misses"] > 0  # worker counters are folded back in
+
+
+def test_operations_document_sends_only_what_the_batch_uses():
+    spec = _many_operations_spec(3)
+    ops = [op for op in _iter_operations(spec) if op[0] == "/items/2"]
+    doc = _operations_document(spec, ops)
+    # /items/0 travels along because the parameter $ref points into it
+    assert set(doc["paths"]) == {"/items/0", "/items/2"}
+    assert set(doc["components"]["schemas"]) == {"Item"}
+
+
+def test_build_tables_stays_serial_below_threshold(monkeypatch):
+    import api_description_tool.tables as tables
+
+    def fail(*args, **kwargs):
+        raise AssertionError("parallel path used")
+
+    monkeypatch.setattr(tables, "_build_tables_parallel", fail)
+    spec = _many_operations_spec(3)
+    assert build_tables(spec, {"tables": {"workers": "4"}}) == build_tables(spec, {})
@@ -1,7 +1,12 @@
 import csv
+import gzip
+import io
 from pathlib import Path
 
-from api_description_tool.writer_csv import write_csv
+import pytest
+
+from api_description_tool.rows import BodyRow, ParamRow, ResponseRow
+from api_description_tool.writer_csv import ALL_TABLES_HEADERS, write_csv, write_csv_stream, write_table_csv
 
 
 def test_write_csv_creates_three_files(tmp_path):
@@ -18,4 +23,68 @@ def test_write_csv_creates_three_files(tmp_path):
         with fp.open(newline="", encoding="utf-8") as f:
             reader = csv.DictReader(f)
             rows = list(reader)
-            assert rows, f"no rows in {fp}"
\ No newline at end of file
+            assert rows, f"no rows in {fp}"
+
+
+def test_write_csv_accepts_generators_and_writes_headers_for_empty_tables(tmp_path):
+    base = tmp_path / "gen"
+    res = ({"Path": "", "Property": f"p{i}", "Status": "200"} for i in range(3))
+
+    written = write_csv(str(base), iter([]), [], res)
+
+    assert written == [str(base) + s for s in ("_params.csv", "_req_body.csv", "_res_body.csv")]
+    assert Path(written[0]).read_text(encoding="utf-8").splitlines() == [
+        "Name,Mandatory,Expected Value(s),In,Description,Examples"
+    ]
+    with Path(written[2]).open(newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert [r["Property"] for r in rows] == ["p0", "p1", "p2"]
+    assert rows[0]["Status"] == "200" and rows[0]["Examples"] == ""
+
+
+def test_write_table_csv_streams_in_chunks_and_gzips(tmp_path, monkeypatch):
+    import api_description_tool.writer_csv as writer_csv
+
+    monkeypatch.setattr(writer_csv, "CHUNK_ROWS", 4)
+    rows = (BodyRow(f"/a{i}", "id", i % 2 == 0, "string", "", "") for i in range(10))
+    path = tmp_path / "t.csv.gz"
+
+    write_table_csv(str(path), BodyRow.HEADERS, rows, compression="gzip")
+
+    with gzip.open(path, "rt", newline="", encoding="utf-8") as f:
+        out = list(csv.reader(f))
+    assert out[0] == list(BodyRow.HEADERS)
+    assert [r[0] for r in out[1:]] == [f"/a{i}" for i in range(10)]
+    assert out[1][2] == "True"
+
+
+def test_write_csv_gzip_suffix(tmp_path):
+    written = write_csv(str(tmp_path / "z"), [], [], [], compression="gzip")
+    assert [Path(p).name for p in written] == ["z_params.csv.gz", "z_req_body.csv.gz", "z_res_body.csv.gz"]
+    assert gzip.open(written[1], "rt", encoding="utf-8").read().startswith("Path,Property")
+
+
+def test_write_csv_stream_all_tables_with_table_column():
+    stream = io.StringIO()
+    params = [ParamRow("limit", False, "integer", "query", "", "")]
+    res = iter([ResponseRow("", "id", True, "integer", "", "", status="200")])
+
+    write_csv_stream(stream, params, [], res)
+
+    rows = list(csv.reader(io.StringIO(stream.getvalue())))
+    assert rows[0] == list(ALL_TABLES_HEADERS)
+    table = [dict(zip(rows[0], r)) for r in rows[1:]]
+    assert [(r["Table"], r["Name"], r["Property"], r["Status"]) for r in table] == [
+        ("params", "limit", "", ""),
+        ("res_body", "", "id", "200"),
+    ]
+    assert table[0]["In"] == "query" and table[1]["Mandatory"] == "True"
+
+
+def test_write_csv_stream_single_table():
+    stream = io.StringIO()
+    write_csv_stream(stream, [ParamRow("limit")], [BodyRow("", "name")], [], table="req_body")
+    assert stream.getvalue().splitlines() == [",".join(BodyRow.HEADERS), ",name,,,,"]
+
+    with pytest.raises(ValueError):
+        write_csv_stream(io.StringIO(), [], [], [], table="nope")
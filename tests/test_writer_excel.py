@@ -1,20 +1,165 @@
 from pathlib import Path
 import openpyxl
+import pytest
 
-from api_description_tool.writer_excel import write_excel
+from api_description_tool.writer_excel import (
+    RES_HEADERS,
+    XLSXWRITER_AVAILABLE,
+    ExcelBackend,
+    _write_sheet,
+    resolve_excel_engine,
+    write_excel,
+)
 
 
-def test_write_excel_creates_sheets_and_headers(tmp_path):
+ENGINES = [
+    "openpyxl",
+    pytest.param("xlsxwriter", marks=pytest.mark.skipif(not XLSXWRITER_AVAILABLE, reason="xlsxwriter not installed")),
+]
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_write_excel_creates_sheets_and_headers(tmp_path, engine):
     xlsx = tmp_path / "out.xlsx"
     params = [{"Name": "x", "Mandatory": True, "Expected Value(s)": "string", "In": "header", "Description": "", "Examples": ""}]
     req = [{"Path": "", "Property": "name", "Mandatory": True, "Expected Value(s)": "string", "Description": "", "Examples": ""}]
     res = [{"Status": "200", "Path": "", "Property": "id", "Mandatory": True, "Expected Value(s)": "integer", "Description": "", "Examples": ""}]
 
-    write_excel(str(xlsx), params, req, res)
+    write_excel(str(xlsx), params, req, res, engine=engine)
 
     assert xlsx.exists()
     wb = openpyxl.load_workbook(str(xlsx))
     assert wb.sheetnames == ["Params", "Req Body", "Res Body"]
     ws_params = wb["Params"]
     headers = [cell.value for cell in ws_params[1]]
-    assert headers[:4] == ["Name", "Mandatory", "Expected Value(s)", "In"]
\ No newline at end of file
+    assert headers[:4] == ["Name", "Mandatory", "Expected Value(s)", "In"]
+    assert wb["Params"].cell(row=2, column=1).font.bold is True
+    res_row = [c.value for c in wb["Res Body"][2]]
+    assert (res_row[0], res_row[2], res_row[3]) == ("200", "id", True)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_write_excel_streams_rows_with_bold_and_widths(tmp_path, engine):
+    xlsx = tmp_path / "stream.xlsx"
+    long_prop = "p" * 80
+    res = (
+        {"Status": "200", "Path": f"/items[{i}]", "Property": long_prop if i == 1 else f"f{i}",
+         "Mandatory": i % 2 == 0, "Expected Value(s)": "string", "Description": "", "Examples": ""}
+        for i in range(5)
+    )
+
+    write_excel(str(xlsx), [], [], res, engine=engine)
+
+    ws = openpyxl.load_workbook(str(xlsx))["Res Body"]
+    assert ws.max_row == 6
+    assert [ws.cell(row=r, column=3).font.bold for r in range(2, 7)] == [True, False, True, False, True]
+    assert ws.cell(row=2, column=1).font.bold is False  # Status is never bold
+    assert ws.column_dimensions["C"].width == pytest.approx(60, abs=1)  # capped
+    assert ws.column_dimensions["A"].width == pytest.approx(len("Status") + 2, abs=1)
+
+
+def test_resolve_excel_engine():
+    assert resolve_excel_engine("openpyxl") == "openpyxl"
+    # xlsxwriter is opt-in: the default stays openpyxl even when it is installed
+    assert resolve_excel_engine() == "openpyxl"
+    assert resolve_excel_engine("") == "openpyxl"
+    assert resolve_excel_engine("auto") == ("xlsxwriter" if XLSXWRITER_AVAILABLE else "openpyxl")
+    with pytest.raises(ValueError):
+        resolve_excel_engine("pandas")
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize("as_list", [True, False])
+def test_write_excel_shards_long_tables(tmp_path, engine, as_list):
+    xlsx = tmp_path / "shards.xlsx"
+    res = [
+        {"Status": "200", "Path": "/" + "x" * (40 if i == 5 else 1), "Property": f"p{i}", "Mandatory": i == 6,
+         "Expected Value(s)": "string", "Description": "", "Examples": ""}
+        for i in range(7)
+    ]
+
+    write_excel(str(xlsx), [], [], res if as_list else iter(res), engine=engine, max_rows_per_sheet=3)
+
+    wb = openpyxl.load_workbook(str(xlsx))
+    assert wb.sheetnames == ["Params", "Req Body", "Res Body (1)", "Res Body (2)", "Res Body (3)"]
+    shards = [wb[f"Res Body ({n})"] for n in (1, 2, 3)]
+    # every shard repeats the headers and no row is lost
+    assert all(ws.cell(row=1, column=1).value == "Status" for ws in shards)
+    props = [ws.cell(row=r, column=3).value for ws in shards for r in range(2, ws.max_row + 1)]
+    assert props == [f"p{i}" for i in range(7)]
+    assert shards[2].cell(row=2, column=3).font.bold is True
+    # widths are per shard: only the second one holds the long path
+    widths = [ws.column_dimensions["B"].width for ws in shards]
+    assert widths[1] == pytest.approx(43, abs=1) and widths[0] == pytest.approx(len("Path") + 2, abs=1)
+
+
+def test_write_excel_table_at_threshold_keeps_one_sheet(tmp_path):
+    xlsx = tmp_path / "exact.xlsx"
+    req = ({"Path": "", "Property": f"p{i}", "Mandatory": False} for i in range(3))
+
+    write_excel(str(xlsx), [], req, [], engine="openpyxl", max_rows_per_sheet=3)
+
+    wb = openpyxl.load_workbook(str(xlsx))
+    assert wb.sheetnames == ["Params", "Req Body", "Res Body"]
+    assert wb["Req Body"].max_row == 4
+
+
+def test_incomplete_backend_fails_on_instantiation():
+    class NoClose(ExcelBackend):
+        def add_sheet(self, title):
+            pass
+
+        def set_widths(self, widths):
+            pass
+
+        def append(self, values, bold=()):
+            pass
+
+    with pytest.raises(TypeError):
+        NoClose()
+
+
+
+class _CountingBackend(ExcelBackend):
+    """Discards rows; records sheet titles and how many rows each received."""
+
+    widths_up_front = False
+
+    def __init__(self, renames_sheets):
+        self.renames_sheets = renames_sheets
+        self.sheets = []
+
+    def add_sheet(self, title):
+        self.sheets.append([title, 0])
+
+    def rename_sheet(self, title):
+        self.sheets[-1][0] = title
+
+    def set_widths(self, widths):
+        pass
+
+    def append(self, values, bold=()):
+        self.sheets[-1][1] += 1
+
+    def close(self):
+        pass
+
+
+@pytest.mark.parametrize("renames_sheets", [True, False])
+def test_write_sheet_memory_stays_flat_for_streamed_rows(renames_sheets):
+    import tracemalloc
+
+    rows = (
+        {"Status": "200", "Path": f"/data/x{i % 25}", "Property": f"prop{i}", "Mandatory": i % 3 == 0,
+         "Expected Value(s)": "string enum=A,B,C", "Description": "d", "Examples": ""}
+        for i in range(30_000)
+    )
+    backend = _CountingBackend(renames_sheets)
+    tracemalloc.start()
+    _write_sheet(backend, "Res Body", RES_HEADERS, rows, bold_fields=["Path"], max_rows=20_000)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    assert backend.sheets == [["Res Body (1)", 20_001], ["Res Body (2)", 10_001]]
+    # holding the first shard in memory would take several MB
+    assert peak < 1_500_000